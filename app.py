@@ -1,4 +1,5 @@
 import streamlit as st
+from config import workbook_status, flight_stats
 from pages import summary
 from pages import direct_tasti
 from pages import top_ten_part
@@ -40,3 +41,19 @@ elif page == "Top Ten Part Number":
 
 elif page == "Sheet Explorer":
     sheet_explorer.render()
+
+# ===============================
+# UMUR SNAPSHOT DATA
+# ===============================
+status = workbook_status()
+if status["ready"]:
+    info = f"🕒 Snapshot data: {int(status['age'] // 60)} menit lalu"
+    if status["refreshing"]:
+        info += " · 🔄 memperbarui..."
+    elif status["error"]:
+        info += " · ⚠️ refresh gagal"
+
+    dup = flight_stats()["suppressed"]
+    if dup:
+        info += f" · {dup} load duplikat dihindari"
+    st.sidebar.caption(info)
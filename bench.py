@@ -0,0 +1,676 @@
+# bench.py
+"""
+Benchmark loader workbook (jalankan manual, bukan bagian dari app).
+
+    python bench.py cache "New BIP Dash 2.4.xlsx"
+    python bench.py download "New BIP Dash 2.4.xlsx" --workers 4
+    python bench.py parallel "New BIP Dash 2.4.xlsx" --workers 4
+    python bench.py backends "New BIP Dash 2.4.xlsx"
+    python bench.py cleaning --rows 354 --months 24
+    python bench.py hierarchy --rows 354 --months 24
+    python bench.py cube --rows 354 --months 24
+    python bench.py memory "New BIP Dash 2.4.xlsx"
+    python bench.py rerun "New BIP Dash 2.4.xlsx"
+"""
+import argparse
+import http.server
+import multiprocessing
+import re
+import tempfile
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from data.cleaning import ffill_text, to_pct, to_upper
+from data.colcache import ColumnarCache, file_sha256, rows_to_table
+from data.cube import build_share_cube
+from data.download import fetch_workbook
+from data.hierarchy import recover_hierarchy
+from data.readers import READERS, available_readers, get_reader
+from data.workbook import (
+    WorkbookSnapshot,
+    grid_frame,
+    list_sheet_names,
+    parse_sheets,
+    read_workbook_rows,
+)
+from data.xlsxparts import sheet_digests
+
+
+def _best_of(fn, repeat=3):
+    best = None
+    result = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        dt = time.perf_counter() - t0
+        best = dt if best is None else min(best, dt)
+    return best, result
+
+
+def _report(title, rows):
+    print(f"\n{title}")
+    width = max(len(name) for name, _ in rows)
+    for name, sec in rows:
+        print(f"  {name:<{width}}  {sec * 1000:9.1f} ms")
+
+
+# =====================================================
+# CACHE KOLUMNAR vs pd.read_excel
+# =====================================================
+def bench_cache(path, repeat):
+    def read_excel_all():
+        return pd.read_excel(path, sheet_name=None, engine="openpyxl", header=None)
+
+    def cache_load():
+        sheets = cache.load(sha)
+        return {name: grid_frame(table) for name, table in sheets.items()}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ColumnarCache(tmp)
+
+        t_excel, expected = _best_of(read_excel_all, repeat)
+        t_hash, sha = _best_of(lambda: file_sha256(path), repeat)
+        t_digest, digests = _best_of(lambda: sheet_digests(path), 1)
+        t_parse, rows = _best_of(lambda: read_workbook_rows(path), 1)
+        t_table, tables = _best_of(
+            lambda: {name: rows_to_table(r) for name, r in rows.items()}, 1
+        )
+        t_store, _ = _best_of(lambda: cache.store(sha, tables, digests), 1)
+        t_load, got = _best_of(cache_load, repeat)
+
+    for name, df in expected.items():
+        pd.testing.assert_frame_equal(df, got[name])
+
+    _report(f"cache vs read_excel: {path}", [
+        ("pd.read_excel (all sheets)", t_excel),
+        ("sha256 file", t_hash),
+        ("sheet digests (cold)", t_digest),
+        ("openpyxl parse (cold)", t_parse),
+        ("rows_to_table", t_table),
+        ("cache store", t_store),
+        ("cache load + frames (warm)", t_load),
+    ])
+    print(f"  speed-up warm vs read_excel: {t_excel / (t_hash + t_load):.1f}x")
+
+
+# =====================================================
+# DOWNLOAD: SINGLE STREAM vs RANGED PARALEL
+# =====================================================
+def _range_server(body, latency, conn_mbps):
+    """
+    Server HTTP lokal yang mendukung Range + ETag.
+    latency   : detik jeda per request (simulasi jaringan)
+    conn_mbps : batas throughput per koneksi (MB/s), 0 = tanpa batas
+    """
+    block = 64 * 1024
+    pause = block / (conn_mbps * 1e6) if conn_mbps else 0
+    etag = '"bench"'
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            time.sleep(latency)
+            rng = self.headers.get("Range")
+            if rng:
+                a, b = re.match(r"bytes=(\d+)-(\d*)", rng).groups()
+                a = int(a)
+                b = min(int(b) if b else len(body) - 1, len(body) - 1)
+                data = body[a:b + 1]
+                self.send_response(206)
+                self.send_header("Content-Range", f"bytes {a}-{b}/{len(body)}")
+            else:
+                data = body
+                self.send_response(200)
+            self.send_header("ETag", etag)
+            self.send_header("Accept-Ranges", "bytes")
+            self.send_header("Content-Type", "application/octet-stream")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            for i in range(0, len(data), block):
+                self.wfile.write(data[i:i + block])
+                time.sleep(pause)
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def bench_download(path, workers, part_size, latency, conn_mbps, repeat):
+    body = Path(path).read_bytes()
+    server = _range_server(body, latency, conn_mbps)
+    url = f"http://127.0.0.1:{server.server_port}/download"
+
+    results = []
+    try:
+        for label, n in (("single stream", 1), (f"ranged x{workers}", workers)):
+            best = None
+            for _ in range(repeat):
+                with tempfile.TemporaryDirectory() as tmp:
+                    stats = fetch_workbook(
+                        url, Path(tmp) / "wb.xlsx",
+                        workers=n, part_size=part_size
+                    )
+                if best is None or stats["seconds"] < best["seconds"]:
+                    best = stats
+            results.append((label, best))
+    finally:
+        server.shutdown()
+
+    print(
+        f"\ndownload: {path} ({len(body) / 1e6:.1f} MB, "
+        f"latency {latency * 1000:.0f} ms/request, {conn_mbps or 'unlimited'} MB/s per connection)"
+    )
+    for label, stats in results:
+        print(
+            f"  {label:<14} {stats['mode']:<7} {stats['seconds'] * 1000:9.1f} ms"
+            f"  {stats['bytes_per_sec'] / 1e6:8.1f} MB/s"
+        )
+
+
+# =====================================================
+# PARSE: BERURUTAN vs PROCESS POOL
+# =====================================================
+def bench_parallel(path, workers, repeat):
+    t_seq, expected = _best_of(lambda: parse_sheets(path, workers=1), repeat)
+
+    rows = [("sequential", t_seq)]
+    for n in sorted({2, workers}):
+        t_par, got = _best_of(lambda: parse_sheets(path, workers=n, min_parallel_bytes=0), repeat)
+        assert got == expected, f"hasil parse paralel ({n} workers) berbeda"
+        rows.append((f"process pool x{n}", t_par))
+
+    _report(f"parse sheets: {path}", rows)
+    for name, sec in rows[1:]:
+        print(f"  speed-up {name}: {t_seq / sec:.2f}x")
+
+
+# =====================================================
+# READER BACKEND: WAKTU + PEAK MEMORI PER SHEET
+# =====================================================
+def _rss_now():
+    # RSS saat ini (byte), Linux saja
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * 4096
+    except OSError:
+        return None
+
+
+def _rss_peak():
+    try:
+        import resource
+    except ImportError:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _measure_backend(path, backend, sheet, cache_dir, repeat):
+    """
+    Jalan di proses baru per (backend, sheet), supaya peak memori
+    tidak tercampur. Backend "snapshot" dibaca dari cache kolumnar
+    di disk (kondisi setelah restart), bukan dari grid di memori.
+    """
+    cache = ColumnarCache(cache_dir) if backend == "snapshot" else None
+    reader = get_reader(backend)
+
+    def read():
+        snapshot = WorkbookSnapshot(path, cache=cache)
+        return reader.read(snapshot, sheet_name=sheet, header=None)
+
+    rss_before = _rss_now()
+    tracemalloc.start()
+    df = read()
+    py_peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    rss_peak = _rss_peak()
+
+    seconds, df = _best_of(read, repeat)
+    rss = rss_peak - rss_before if rss_before is not None and rss_peak else None
+    return seconds, py_peak, rss, df
+
+
+def bench_backends(path, repeat):
+    sheets = list_sheet_names(path)
+    backends = available_readers()
+    ctx = multiprocessing.get_context("spawn")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # isi cache kolumnar dulu (sama seperti app setelah load pertama)
+        WorkbookSnapshot(path, cache=ColumnarCache(tmp)).load()
+
+        results = {}
+        for backend in backends:
+            for sheet in sheets:
+                with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+                    results[backend, sheet] = pool.submit(
+                        _measure_backend, path, backend, sheet, tmp, repeat
+                    ).result()
+
+    print(f"\nreader backends: {path}  (vs openpyxl; rss = peak RSS naik, py = peak tracemalloc)")
+    width = max(len(s) for s in sheets)
+    for sheet in sheets:
+        expected = results["openpyxl", sheet][3]
+        for backend in backends:
+            seconds, py_peak, rss, df = results[backend, sheet]
+            try:
+                pd.testing.assert_frame_equal(expected, df)
+                same = "identical"
+            except AssertionError:
+                same = "DIFFERENT"
+            rss_mb = f"{rss / 1e6:7.1f} MB" if rss is not None else "      n/a"
+            print(
+                f"  {sheet:<{width}}  {backend:<9} {seconds * 1000:9.1f} ms"
+                f"  rss {rss_mb}  py {py_peak / 1e6:7.1f} MB  {same}"
+            )
+
+    missing = sorted(set(READERS) - set(backends))
+    if missing:
+        print(f"  (tidak terpasang: {', '.join(missing)})")
+
+
+# =====================================================
+# CLEANING: PER SEL (.apply) vs VEKTOR (data/cleaning.py)
+# =====================================================
+def _parse_pct_cell(v):
+    # versi lama load_clean_revbykab, sebagai pembanding
+    if pd.isna(v):
+        return np.nan
+    if isinstance(v, (int, float)):
+        return v / 100 if v > 1.5 else v
+    s = str(v).replace("%", "").replace(",", "")
+    try:
+        x = float(s)
+        return x / 100 if x > 1.5 else x
+    except:
+        return np.nan
+
+
+def _strip_cell(x):
+    return x.strip() if isinstance(x, str) and x.strip() != "" else np.nan
+
+
+def _route_cell(v):
+    return v.strip().upper() if isinstance(v, str) and v.strip() != "" else np.nan
+
+
+def _clean_per_cell(df, months):
+    out = {}
+    for col in ("Pulau", "Provinsi", "Kab Kota"):
+        out[col] = df[col].apply(_strip_cell).ffill()
+    out["Route"] = df["Route"].apply(_route_cell)
+    for c in months:
+        out[c] = df[c].apply(_parse_pct_cell)
+    return pd.DataFrame(out, index=df.index)
+
+
+def _clean_vectorized(df, months):
+    out = {}
+    for col in ("Pulau", "Provinsi", "Kab Kota"):
+        out[col] = ffill_text(df[col])
+    out["Route"] = to_upper(df["Route"])
+    for c in months:
+        out[c] = to_pct(df[c])
+    return pd.DataFrame(out, index=df.index)
+
+
+def _revbykab_like(n_rows, n_months, seed=0):
+    """
+    Frame mentah mirip tabel persentase RevbyKab (object, campuran
+    pecahan, persen > 1.5, string "45.2%", sel kosong).
+    """
+    rng = np.random.default_rng(seed)
+    islands = np.array(["SUMATERA", "JAWA", "KALIMANTAN", "SULAWESI", "BALI NT"])
+
+    data = {
+        "Pulau": np.where(rng.random(n_rows) < 0.05, rng.choice(islands, n_rows), None),
+        "Provinsi": np.where(rng.random(n_rows) < 0.2, "  Prov X ", "  "),
+        "Kab Kota": np.where(np.arange(n_rows) % 2 == 0, "Kab Y", None),
+        "Route": np.where(np.arange(n_rows) % 2 == 0, "DIRECT", " tasti "),
+    }
+    months = [f"M{i + 1:03d}" for i in range(n_months)]
+    for m in months:
+        x = rng.random(n_rows)
+        kind = rng.random(n_rows)
+        col = x.astype(object)
+        col[kind < 0.15] = x[kind < 0.15] * 100
+        col[kind < 0.10] = [f"{v * 100:.1f}%" for v in x[kind < 0.10]]
+        col[kind < 0.05] = None
+        data[m] = col
+    return pd.DataFrame(data).astype(object), months
+
+
+def bench_cleaning(rows, months, repeat):
+    print(f"\ncleaning RevbyKab-like table (per sel .apply vs vektor)")
+    print(f"  {'scale':<6} {'rows':>7} {'months':>6} {'per cell':>11} {'vectorized':>11} {'ns/cell vec':>12}  speed-up")
+    for scale in (1, 10, 100):
+        n_rows = rows * scale
+        n_months = months if scale < 100 else months * 10
+        n_rows = n_rows if scale < 100 else rows * 10
+        df, cols = _revbykab_like(n_rows, n_months)
+
+        t_old, expected = _best_of(lambda: _clean_per_cell(df, cols), 1 if scale == 100 else repeat)
+        t_new, got = _best_of(lambda: _clean_vectorized(df, cols), repeat)
+        pd.testing.assert_frame_equal(expected, got)
+
+        cells = n_rows * (n_months + 4)
+        print(
+            f"  {scale:>4}x  {n_rows:>7} {n_months:>6} {t_old * 1000:9.1f} ms {t_new * 1000:9.1f} ms"
+            f" {t_new / cells * 1e9:10.0f}    {t_old / t_new:6.1f}x"
+        )
+
+
+# =====================================================
+# HIERARKI: LOOP PER BARIS vs MASK
+# =====================================================
+PULAU = ("SUMATERA", "JAWA", "KALIMANTAN", "SULAWESI", "BALI NT")
+
+
+def _recover_hierarchy_loop(df):
+    # versi lama recover_hierarchy_from_rows, sebagai pembanding
+    cur_pulau = None
+    cur_prov = None
+
+    for i in range(len(df)):
+        row = df.iloc[i]
+
+        filled_cells = [
+            c for c in df.columns
+            if isinstance(row[c], str) and row[c].strip() != ""
+        ]
+
+        if len(filled_cells) == 1:
+            val = row[filled_cells[0]].strip().upper()
+            if val in PULAU:
+                cur_pulau = val
+                cur_prov = None
+            else:
+                cur_prov = val
+            continue
+
+        if cur_pulau:
+            df.at[i, "Pulau"] = cur_pulau
+        if cur_prov:
+            df.at[i, "Provinsi"] = cur_prov
+
+    return df
+
+
+def _grouped_like(n_rows, n_months, seed=0):
+    """
+    Export pivot "grouped rows": header pulau, header provinsi (satu sel
+    teks), lalu baris data Kab Kota / Route + angka bulanan.
+    """
+    rng = np.random.default_rng(seed)
+    kind = rng.random(n_rows)
+    pulau = rng.choice(np.array(PULAU), n_rows)
+
+    label = np.full(n_rows, None, dtype=object)
+    label[kind < 0.10] = [f" Prov {i} " for i in np.flatnonzero(kind < 0.10)]
+    label[kind < 0.02] = pulau[kind < 0.02]
+    is_data = label == None     # noqa: E711 (elementwise)
+
+    data = {
+        "Pulau": np.full(n_rows, None, dtype=object),
+        "Provinsi": np.full(n_rows, None, dtype=object),
+        "Kab Kota": np.where(is_data, "Kab Y", label),
+        "Route": np.where(is_data, "DIRECT", None),
+    }
+    for i in range(n_months):
+        x = rng.random(n_rows).astype(object)
+        x[~is_data] = None
+        data[f"M{i + 1:03d}"] = x
+    return pd.DataFrame(data)
+
+
+def bench_hierarchy(rows, months, repeat):
+    print(f"\nhierarchy recovery (loop per baris vs mask)")
+    print(f"  {'scale':<6} {'rows':>7} {'cols':>5} {'loop':>11} {'vectorized':>11}  speed-up")
+    for scale in (1, 10, 100):
+        df = _grouped_like(rows * scale, months)
+
+        t_old, expected = _best_of(lambda: _recover_hierarchy_loop(df.copy()), 1 if scale == 100 else repeat)
+        t_new, got = _best_of(lambda: recover_hierarchy(df.copy(), PULAU), repeat)
+        pd.testing.assert_frame_equal(expected, got)
+
+        print(
+            f"  {scale:>4}x  {len(df):>7} {len(df.columns):>5} {t_old * 1000:9.1f} ms {t_new * 1000:9.1f} ms"
+            f"    {t_old / t_new:6.1f}x"
+        )
+
+
+# =====================================================
+# GRAPH MODE: MELT PER RERUN vs CUBE
+# =====================================================
+def _clean_pct_like(n_rows, n_months, seed=0):
+    """
+    Tabel persentase yang sudah bersih (dims category, pangsa float).
+    """
+    rng = np.random.default_rng(seed)
+    n_kab = n_rows // 2
+    kab = np.repeat([f"KAB {i:05d}" for i in range(n_kab)], 2)[:n_rows]
+    prov = np.repeat([f"PROV {i:03d}" for i in range(n_kab // 8 + 1)], 16)[:n_rows]
+
+    data = {
+        "Pulau": rng.choice(PULAU, n_rows),
+        "Provinsi": prov,
+        "Kab Kota": kab,
+        "Route": np.tile(["DIRECT", "TASTI"], n_rows // 2 + 1)[:n_rows],
+    }
+    months = [f"M{i + 1:03d}" for i in range(n_months)]
+    for m in months:
+        x = rng.random(n_rows)
+        x[rng.random(n_rows) < 0.05] = np.nan
+        data[m] = x
+
+    df = pd.DataFrame(data)
+    for c in ("Pulau", "Provinsi", "Kab Kota", "Route"):
+        df[c] = df[c].astype("category")
+    return df, months
+
+
+def _graph_melt(df, months):
+    # jalur lama pages/direct_tasti.py (Graph mode) per rerun
+    pct_cols = [c for c in months if df[c].notna().sum() > 0 and df[c].max() <= 1.5]
+    df_long = (
+        df[["Kab Kota", "Route"] + pct_cols]
+        .melt(id_vars=["Kab Kota", "Route"], var_name="Month", value_name="Share")
+        .dropna(subset=["Share"])
+    )
+    df_last = df_long[df_long["Month"] == pct_cols[-1]]
+    kpi = df_last.groupby("Route", observed=True)["Share"].mean()
+    bar = df_last.groupby(["Kab Kota", "Route"], as_index=False, observed=True)["Share"].mean()
+    return kpi, bar, len(df_long)
+
+
+def _graph_cube(cube):
+    rows = np.arange(len(cube))
+    pct_cols = cube.months_with_data(rows, max_share=1.5)
+    kpi = cube.mean_by(rows, pct_cols[-1], ["Route"]).set_index("Route")["Share"]
+    bar = cube.mean_by(rows, pct_cols[-1], ["Kab Kota", "Route"])
+    return kpi, bar, cube.count(rows, pct_cols)
+
+
+def bench_cube(rows, months, repeat):
+    print(f"\ngraph mode Direct TASTI (melt per rerun vs slice cube)")
+    print(f"  {'scale':<6} {'rows':>7} {'months':>6} {'build':>11} {'melt':>11} {'cube':>11}  speed-up")
+    for scale in (1, 10, 100):
+        df, cols = _clean_pct_like(rows * scale, months)
+
+        t_build, cube = _best_of(
+            lambda: build_share_cube(df, ("Pulau", "Provinsi", "Kab Kota", "Route"), cols),
+            repeat
+        )
+        t_old, expected = _best_of(lambda: _graph_melt(df, cols), repeat)
+        t_new, got = _best_of(lambda: _graph_cube(cube), repeat)
+
+        assert expected[2] == got[2]
+        np.testing.assert_allclose(expected[0].to_numpy(), got[0].to_numpy(), rtol=1e-12)
+        np.testing.assert_allclose(expected[1]["Share"], got[1]["Share"], rtol=1e-12)
+
+        print(
+            f"  {scale:>4}x  {len(df):>7} {len(cols):>6} {t_build * 1000:9.1f} ms"
+            f" {t_old * 1000:9.1f} ms {t_new * 1000:9.1f} ms    {t_old / t_new:6.1f}x"
+        )
+
+
+# =====================================================
+# MEMORI DATASET CACHE (SEBELUM / SESUDAH KOMPAKSI)
+# =====================================================
+def bench_memory(path):
+    import config
+    from streamlit.logger import set_log_level
+
+    set_log_level("error")     # cache_data di luar `streamlit run`
+
+    config.IS_CLOUD = False
+    config.LOCAL_DEV_PATH = Path(path)
+
+    from data.revbykab import load_revbykab_dataset
+    from pages.top_ten_part import load_topten_part
+
+    version = config.workbook_version()
+    load_revbykab_dataset(version)
+    load_topten_part(version)
+
+    print(f"\nmemory per cached dataset: {path}")
+    print(f"  {'dataset':<16} {'rows':>7} {'before':>11} {'after':>11}  ratio")
+    for r in config.memory_report():
+        print(
+            f"  {r['dataset']:<16} {r['rows']:>7} {r['before'] / 1e6:8.2f} MB {r['after'] / 1e6:8.2f} MB"
+            f"  {r['before'] / max(r['after'], 1):5.1f}x"
+        )
+    before, after = config.get_memory_report().totals()
+    print(f"  {'total':<16} {'':>7} {before / 1e6:8.2f} MB {after / 1e6:8.2f} MB  {before / max(after, 1):5.1f}x")
+
+
+# =====================================================
+# ALOKASI PER RERUN (APPTEST, DATASET SUDAH HANGAT)
+# =====================================================
+RERUN_PAGES = [
+    ("Summary", None),
+    ("Direct TASTI Details", "Percentage"),
+    ("Direct TASTI Details", "Value"),
+    ("Direct TASTI Details", "Graph"),
+    ("Top Ten Part Number", None),
+    ("Sheet Explorer", None),
+]
+
+
+def bench_rerun(path, repeat):
+    from streamlit.logger import set_log_level
+    from streamlit.testing.v1 import AppTest
+
+    set_log_level("error")
+    root = Path(__file__).resolve().parent
+
+    with tempfile.TemporaryDirectory() as tmp:
+        script = Path(tmp) / "app_local.py"
+        script.write_text(
+            "import sys\n"
+            f"sys.path.insert(0, {str(root)!r})\n"
+            "from pathlib import Path\n"
+            "import config\n"
+            "config.IS_CLOUD = False\n"
+            f"config.LOCAL_DEV_PATH = Path({str(Path(path).resolve())!r})\n"
+            f"exec(open({str(root / 'app.py')!r}, encoding='utf-8').read())\n"
+        )
+
+        print(f"\nallocation per rerun (tracemalloc peak, dataset hangat): {path}")
+        for page, mode in RERUN_PAGES:
+            at = AppTest.from_file(str(script), default_timeout=600)
+            at.run()
+            at.sidebar.radio[0].set_value(page).run()
+            if mode:
+                at.main.radio[0].set_value(mode).run()
+            at.run()
+
+            peaks = []
+            tracemalloc.start()
+            t0 = time.perf_counter()
+            for _ in range(repeat):
+                tracemalloc.reset_peak()
+                base = tracemalloc.get_traced_memory()[0]
+                at.run()
+                peaks.append(tracemalloc.get_traced_memory()[1] - base)
+            dt = (time.perf_counter() - t0) / repeat
+            tracemalloc.stop()
+
+            name = page if mode is None else f"{page} / {mode}"
+            print(f"  {name:<36} {min(peaks) / 1e6:8.2f} MB {dt * 1000:9.0f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    p = sub.add_parser("cache", help="Arrow cache vs pd.read_excel")
+    p.add_argument("path")
+
+    p = sub.add_parser("download", help="single stream vs ranged paralel")
+    p.add_argument("path")
+    p.add_argument("--workers", type=int, default=4)
+    p.add_argument("--part-size", type=int, default=1024 * 1024)
+    p.add_argument("--latency", type=float, default=0.05)
+    p.add_argument("--conn-mbps", type=float, default=2.0)
+
+    p = sub.add_parser("parallel", help="parse sheet berurutan vs process pool")
+    p.add_argument("path")
+    p.add_argument("--workers", type=int, default=4)
+
+    p = sub.add_parser("backends", help="reader backend: waktu + peak memori per sheet")
+    p.add_argument("path")
+
+    p = sub.add_parser("cleaning", help="cleaning RevbyKab: per sel vs vektor")
+    p.add_argument("--rows", type=int, default=354)
+    p.add_argument("--months", type=int, default=24)
+
+    p = sub.add_parser("hierarchy", help="recover hierarchy: loop per baris vs mask")
+    p.add_argument("--rows", type=int, default=354)
+    p.add_argument("--months", type=int, default=24)
+
+    p = sub.add_parser("cube", help="graph Direct TASTI: melt per rerun vs cube")
+    p.add_argument("--rows", type=int, default=354)
+    p.add_argument("--months", type=int, default=24)
+
+    p = sub.add_parser("memory", help="byte dataset cache sebelum / sesudah kompaksi")
+    p.add_argument("path")
+
+    p = sub.add_parser("rerun", help="alokasi memori per rerun tiap page (AppTest)")
+    p.add_argument("path")
+
+    args = parser.parse_args()
+
+    if args.cmd == "cache":
+        bench_cache(args.path, args.repeat)
+    elif args.cmd == "download":
+        bench_download(
+            args.path, args.workers, args.part_size,
+            args.latency, args.conn_mbps, args.repeat
+        )
+    elif args.cmd == "parallel":
+        bench_parallel(args.path, args.workers, args.repeat)
+    elif args.cmd == "backends":
+        bench_backends(args.path, args.repeat)
+    elif args.cmd == "cleaning":
+        bench_cleaning(args.rows, args.months, args.repeat)
+    elif args.cmd == "hierarchy":
+        bench_hierarchy(args.rows, args.months, args.repeat)
+    elif args.cmd == "cube":
+        bench_cube(args.rows, args.months, args.repeat)
+    elif args.cmd == "memory":
+        bench_memory(args.path)
+    elif args.cmd == "rerun":
+        bench_rerun(args.path, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
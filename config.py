@@ -1,10 +1,26 @@
 import streamlit as st
-import pandas as pd
-import requests
 from pathlib import Path
+import os
 import platform
 import tempfile
 
+from data.cleaning import dim_label
+from data.colcache import ColumnarCache
+from data.compact import MemoryReport, compact_frame, frame_bytes
+from data.download import fetch_workbook
+from data.pivotcache import pivot_caches, read_pivot_facts
+from data.readers import get_reader
+from data.registry import DatasetRegistry
+from data.singleflight import SingleFlight
+from data.xlsxparts import data_row_count, sheet_metadata
+from data.workbook import (
+    SheetRowCache,
+    WorkbookSnapshot,
+    WorkbookStore,
+    list_sheet_names,
+    read_sheet_head,
+)
+
 # ===============================
 # DETECT ENVIRONMENT (FIXED)
 # ===============================
@@ -29,66 +45,294 @@ DOWNLOAD_URL = (
 TMP_DIR = Path(tempfile.gettempdir())
 CLOUD_PATH = TMP_DIR / "New BIP Dash 2.4.xlsx"
 
+# download paralel per potongan (HTTP Range), 1 = satu stream
+DOWNLOAD_WORKERS = 4
+
+# cache kolumnar (Arrow) hasil parse, di sebelah CLOUD_PATH
+CACHE_DIR = TMP_DIR / "bip_cache"
+
+# file pin per snapshot (hard link ke versi yang dilayani, lihat data/workbook.pin_file);
+# bukan di CACHE_DIR karena ColumnarCache.prune membersihkan folder asing di sana
+SNAPSHOT_DIR = TMP_DIR / "bip_snapshots"
+
+# parse sheet paralel di process pool (1 = berurutan)
+PARSE_WORKERS = min(4, os.cpu_count() or 1)
+
+# backend pembaca sheet untuk load_excel: "snapshot", "openpyxl", "calamine";
+# dipilih lewat env BIP_READER_BACKEND, tanpa mengubah kode
+# (bandingkan dulu dengan: python bench.py backends <xlsx>)
+READER_BACKEND = os.environ.get("BIP_READER_BACKEND") or "snapshot"
+
+# backend salah ketik / paketnya belum terpasang -> gagal saat start,
+# bukan di tengah render page
+try:
+    get_reader(READER_BACKEND)
+except (ImportError, ValueError) as e:
+    raise type(e)(f"BIP_READER_BACKEND={READER_BACKEND!r}: {e}") from None
+
+# stale-while-revalidate: snapshot lebih tua dari ini dicek ulang di background
+REFRESH_SECONDS = 600
+
 # ===============================
 # DOWNLOAD FOR CLOUD ONLY
 # ===============================
-@st.cache_resource
 def download_excel_cloud():
     TMP_DIR.mkdir(parents=True, exist_ok=True)
 
-    if CLOUD_PATH.exists() and CLOUD_PATH.stat().st_size > 1_000_000:
-        return CLOUD_PATH
+    # conditional request: file tidak berubah = 304, nol byte
+    fetch_workbook(
+        DOWNLOAD_URL,
+        CLOUD_PATH,
+        params={
+            "id": FILE_ID,
+            "export": "download",
+            "confirm": "t"
+        },
+        timeout=120,
+        workers=DOWNLOAD_WORKERS
+    )
+
+    return CLOUD_PATH
 
-    with st.spinner("📥 Downloading Excel from Google Drive..."):
-        r = requests.get(
-            DOWNLOAD_URL,
-            params={
-                "id": FILE_ID,
-                "export": "download",
-                "confirm": "t"
-            },
-            stream=True,
-            timeout=120
-        )
 
-        if r.status_code != 200:
-            raise RuntimeError(f"Download failed ({r.status_code})")
+def _acquire_workbook():
+    if IS_CLOUD:
+        return download_excel_cloud()
 
-        # 🔥 VALIDASI MIME TYPE
-        content_type = r.headers.get("Content-Type", "")
-        if "text/html" in content_type.lower():
-            raise RuntimeError(
-                "Google Drive returned HTML, not Excel. "
-                "Check sharing permission (must be Anyone with link → Viewer)"
-            )
+    path = LOCAL_DEV_PATH
+    if not path.exists():
+        raise FileNotFoundError(f"Local Excel not found: {path}")
+    return path
 
-        with open(CLOUD_PATH, "wb") as f:
-            for chunk in r.iter_content(1024 * 1024):
-                if chunk:
-                    f.write(chunk)
 
-    return CLOUD_PATH
+def _build_snapshot(path):
+    if READER_BACKEND != "snapshot":
+        # backend berbasis file cuma butuh path + versi snapshot:
+        # tanpa cache kolumnar, grid sheet tidak pernah di-parse / ditulis
+        return WorkbookSnapshot(path, flight=get_flights())
+
+    return WorkbookSnapshot(
+        path,
+        cache=ColumnarCache(CACHE_DIR),
+        flight=get_flights(),
+        sheet_cache=get_sheet_cache(),
+        parse_workers=PARSE_WORKERS
+    )
+
+
+@st.cache_resource
+def get_sheet_cache():
+    # grid per sheet yang tidak berubah dipakai ulang antar versi file
+    return SheetRowCache()
+
+
+# ===============================
+# SINGLE-FLIGHT (DOWNLOAD & PARSE DIBAGI ANTAR SESI)
+# ===============================
+@st.cache_resource
+def get_flights():
+    return SingleFlight()
+
+
+def flight_stats():
+    return get_flights().stats()
+
+
+# ===============================
+# DATASET BERSAMA (READ-ONLY, SATU OBJEK UNTUK SEMUA SESI)
+# ===============================
+@st.cache_resource
+def get_datasets():
+    return DatasetRegistry(max_entries=64, flight=get_flights())
+
+
+def shared_dataset(key, build):
+    """
+    key    : tuple yang memuat versi workbook
+    build  : function() -> dataset, jalan sekali per key untuk semua sesi
+    return : salinan dangkal dataset (ganti / tambah kolom bebas; tulis
+             in-place gagal karena array bersama read-only)
+    """
+    return get_datasets().get(key, build)
+
+
+# ===============================
+# WORKBOOK SNAPSHOT (STALE-WHILE-REVALIDATE)
+# ===============================
+@st.cache_resource
+def get_workbook_store():
+    return WorkbookStore(
+        _acquire_workbook,
+        _build_snapshot,
+        max_age=REFRESH_SECONDS,
+        flight=get_flights(),
+        pin_dir=SNAPSHOT_DIR
+    )
+
+
+def get_workbook():
+    """
+    Snapshot yang sedang dilayani. Hanya load pertama yang menunggu
+    (download + pin file, tanpa parse sheet); refresh berikutnya jalan
+    di background lalu di-swap.
+    """
+    store = get_workbook_store()
+    if store.ready:
+        return store.current()
+
+    msg = "📥 Downloading Excel from Google Drive..." if IS_CLOUD else "📥 Loading Excel..."
+    with st.spinner(msg):
+        return store.current()
+
+
+def get_workbook_path():
+    return get_workbook().path
+
+
+def workbook_version():
+    return get_workbook().version
+
+
+def workbook_status():
+    return get_workbook_store().status()
+
 
 # ===============================
 # GLOBAL EXCEL LOADER
 # ===============================
-@st.cache_data(ttl=600)
 def load_excel(sheet_name=None, **kwargs):
-    if IS_CLOUD:
-        path = download_excel_cloud()
-    else:
-        path = LOCAL_DEV_PATH
-        if not path.exists():
-            raise FileNotFoundError(f"Local Excel not found: {path}")
+    wb = get_workbook()
+    key = (
+        "load_excel", wb.version, READER_BACKEND,
+        repr(sheet_name), repr(sorted(kwargs.items()))
+    )
+    reader = get_reader(READER_BACKEND)
+    return shared_dataset(
+        key,
+        lambda: reader.read(wb, sheet_name=sheet_name, **kwargs)
+    )
 
-    return pd.read_excel(
-        path,
-        sheet_name=sheet_name,
-        engine="openpyxl",
-        **kwargs
+
+# ===============================
+# STREAMING READER (MEMORI TERBATAS)
+# ===============================
+STREAM_CHUNK_ROWS = 2000
+
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def _list_sheets(version, path):
+    return list_sheet_names(path)
+
+
+def list_excel_sheets():
+    wb = get_workbook()
+    return _list_sheets(wb.version, str(wb.path))
+
+
+def load_excel_head(sheet_name, max_rows, **kwargs):
+    """
+    Dibaca streaming dari file pin snapshot, jadi melihat sekilas sheet
+    tidak memaksa parse grid sheet itu (WorkbookSnapshot parse saat dibaca).
+
+    return : (DataFrame maksimal max_rows baris, total baris data di sheet)
+    """
+    wb = get_workbook()
+    key = (
+        "head", wb.version, sheet_name, max_rows,
+        repr(sorted(kwargs.items()))
+    )
+    return shared_dataset(
+        key,
+        lambda: read_sheet_head(
+            str(wb.path),
+            sheet_name,
+            max_rows,
+            chunk_rows=STREAM_CHUNK_ROWS,
+            **kwargs
+        )
     )
 
 
+# ===============================
+# METADATA SHEET (TANPA DATAFRAME)
+# ===============================
+def sheet_row_counts(sheets, header=0):
+    """
+    return : dict {sheet_name: jumlah baris}, sama dengan
+             load_excel(sheet_name, header=header).shape[0] tapi dibaca
+             langsung dari XML sheet (data/xlsxparts.sheet_metadata)
+             di file pin snapshot; tidak menunggu parse grid sheet
+    """
+    wb = get_workbook()
+    meta = shared_dataset(
+        ("sheet_meta", wb.version, tuple(sheets)),
+        lambda: sheet_metadata(str(wb.path), sheets)
+    )
+    return {name: data_row_count(meta[name], header) for name in sheets}
+
+
+# ===============================
+# PIVOT CACHE (FACT TABLE DI BALIK PIVOT)
+# ===============================
+@st.cache_data(max_entries=4, show_spinner=False)
+def _pivot_sheets(version, path):
+    return {
+        sheet: cache["n_records"]
+        for cache in pivot_caches(path)
+        for sheet, _ in cache["pivot_tables"]
+    }
+
+
+def pivot_sheets():
+    """
+    return : dict {sheet_name: jumlah record} untuk sheet yang berisi pivot table
+    """
+    wb = get_workbook()
+    return _pivot_sheets(wb.version, str(wb.path))
+
+
+def load_pivot_facts(sheet_name):
+    """
+    Fact table mentah (pivotCacheRecords) di balik pivot di `sheet_name`,
+    satu baris per record sumber, tanpa layout pivot.
+    """
+    wb = get_workbook()
+    return shared_dataset(
+        ("pivot_facts", wb.version, sheet_name),
+        lambda: read_pivot_facts(str(wb.path), sheet_name)
+    )
+
+
+# ===============================
+# KOMPAKSI DATASET CACHE (data/compact.py)
+# ===============================
+@st.cache_resource
+def get_memory_report():
+    return MemoryReport()
+
+
+def compact_dataset(name, df, **columns):
+    """
+    Kompaksi df (lihat compact_frame) dan catat byte sebelum / sesudah
+    di memory_report() dengan nama `name`.
+    """
+    out = compact_frame(df, **columns)
+    get_memory_report().record(
+        name,
+        0 if df is None else len(df),
+        frame_bytes(df),
+        frame_bytes(out)
+    )
+    return out
+
+
+def memory_report():
+    """
+    return : list dict {"dataset", "rows", "before", "after"} (byte)
+    """
+    return get_memory_report().rows()
+
+
 # ===============================
 # SHEET NAMES
 # ===============================
@@ -97,3 +341,52 @@ SHEET_NAME_REVNAT   = "RevbyNat"
 SHEET_NAME_REVPROV  = "RevbyProv"
 SHEET_NAME_PNVAR    = "PN Varians"
 SHEET_NAME_TOPPART  = "Top10Part"
+
+
+# ===============================
+# SHEET SCHEMAS (lihat data/schema.py)
+# ===============================
+REVKAB_DIMS = ("Pulau", "Provinsi", "Kab Kota", "Route")
+
+# header grup level atas di export pivot RevbyKab (data/hierarchy.py)
+PULAU_NAMES = ("SUMATERA", "JAWA", "KALIMANTAN", "SULAWESI", "BALI NT")
+
+MONTH_NAMES = (
+    "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December"
+)
+
+SHEET_SCHEMAS = {
+    # dua tabel di satu sheet, header keduanya memuat REVKAB_DIMS
+    # (label dicocokkan seperti canonicalize_columns: "PULAU", "Kab/Kota"):
+    # persentase di atas, value di bawahnya
+    SHEET_NAME_REVKAB: {
+        "anchor": REVKAB_DIMS,
+        "labels": dim_label,
+        "tables": {
+            "pct": {
+                "end": "trim",
+                "names": "raw",
+                "require": REVKAB_DIMS,
+                "dtypes": {
+                    "Pulau": "text",
+                    "Provinsi": "text",
+                    "Kab Kota": "text",
+                    "Route": "upper",
+                    "Type": None,
+                    "*": "pct",
+                },
+            },
+            "value": {
+                "names": "pandas",
+            },
+        },
+    },
+    SHEET_NAME_TOPPART: {
+        "anchor": "Part Number",
+        "names": "pandas",
+        "until": "Trend",
+        "drop_unnamed": True,
+        "dtypes": {f"{m}*": "number" for m in MONTH_NAMES},
+    },
+}
@@ -0,0 +1,157 @@
+# data/cleaning.py
+"""
+Pembersihan kolom secara vektor (per kolom, bukan per sel).
+Hasil harus identik dengan versi lama yang pakai .apply per sel.
+"""
+import re
+
+import numpy as np
+import pandas as pd
+
+_PCT_JUNK = str.maketrans("", "", "%,")
+_FLOAT_RE = re.compile(r"\s*[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?\s*")
+
+
+# =====================================================
+# TEKS
+# =====================================================
+def _strip_or_nan(v):
+    if isinstance(v, str):
+        v = v.strip()
+        if v != "":
+            return v
+    return np.nan
+
+
+def _upper_or_nan(v):
+    v = _strip_or_nan(v)
+    return v.upper() if isinstance(v, str) else v
+
+
+def _map_unique(s, fn):
+    """
+    fn per nilai unik (kolom dimensi cuma punya sedikit nilai unik),
+    lalu disebar lagi ke semua baris dengan take.
+    fn harus memetakan nilai bukan string ke NaN.
+    """
+    if not len(s):
+        return s.apply(fn)
+    if s.dtype.kind in "biufcmM":
+        # kolom angka / tanggal: tidak ada string sama sekali
+        return pd.Series(np.nan, index=s.index, name=s.name)
+    if s.dtype != object:
+        return s.apply(fn)
+
+    # cuma sel string yang perlu fn; sisanya pasti NaN
+    values = s.to_numpy()
+    is_str = np.fromiter(map(type, values), dtype=object, count=len(values)) == str
+    codes = np.full(len(values), -1, dtype=np.intp)
+    codes[is_str], uniques = pd.factorize(values[is_str])
+
+    cleaned = [fn(u) for u in uniques]
+
+    # .apply per sel menghasilkan float64 kalau tidak ada string yang tersisa
+    if not any(isinstance(v, str) for v in cleaned):
+        return pd.Series(np.nan, index=s.index, name=s.name)
+
+    cleaned = np.array(cleaned + [np.nan], dtype=object)
+    return pd.Series(cleaned[codes], index=s.index, name=s.name, dtype=object)
+
+
+def to_text(s):
+    """
+    Strip spasi; string kosong / bukan string -> NaN.
+    """
+    return _map_unique(s, _strip_or_nan)
+
+
+def to_upper(s):
+    """
+    Seperti to_text, lalu huruf besar (Route: " tasti " -> "TASTI").
+    """
+    return _map_unique(s, _upper_or_nan)
+
+
+def ffill_text(s):
+    return to_text(s).ffill()
+
+
+def dim_label(label):
+    """
+    Nama kanonik kolom dims untuk label header ("PULAU", "Kab/Kota",
+    "Prov." ...), tidak peka huruf besar / tanda baca.
+
+    return : "Pulau" / "Provinsi" / "Kab Kota" / "Route" / "Type", None
+             kalau label bukan kolom dims
+    """
+    k = str(label).lower()
+    if "pulau" in k:
+        return "Pulau"
+    if "prov" in k:
+        return "Provinsi"
+    if "kab" in k or "kota" in k:
+        return "Kab Kota"
+    if "route" in k:
+        return "Route"
+    if "type" in k:
+        return "Type"
+    return None
+
+
+# =====================================================
+# ANGKA
+# =====================================================
+def _parse_floats(text):
+    """
+    text   : list string (sudah tanpa % dan ,)
+    return : ndarray float, NaN kalau bukan angka (aturan float() Python)
+    """
+    values = np.array(text, dtype=object)
+    try:
+        return values.astype(float)
+    except ValueError:
+        pass
+
+    # ada string yang bukan angka ("-", "N/A"): yang formatnya angka tetap
+    # dikonversi sekaligus, sisanya satu per satu dengan float()
+    ok = np.fromiter((_FLOAT_RE.fullmatch(v) is not None for v in text), dtype=bool, count=len(text))
+    out = np.full(len(values), np.nan)
+    out[ok] = values[ok].astype(float)
+    for i in np.flatnonzero(~ok):
+        try:
+            out[i] = float(values[i])
+        except ValueError:
+            pass
+    return out
+
+
+def to_pct(s):
+    """
+    Persentase -> pecahan. Angka > 1.5 dianggap persen (45 -> 0.45),
+    string "45%" / "1,234" dibersihkan dulu, selain itu NaN.
+    Hasil selalu float64 (sel boolean jadi 1.0 / 0.0).
+    """
+    if not len(s):
+        return s.copy()
+
+    if s.dtype == object:
+        values = s.to_numpy()
+        is_str = np.fromiter(map(type, values), dtype=object, count=len(values)) == str
+
+        # sel angka: langsung; sel string (biasanya sedikit): parse seperti float()
+        numbers = values.copy()
+        numbers[is_str] = np.nan
+        x = pd.to_numeric(numbers, errors="coerce").astype(float)
+        if is_str.any():
+            x[is_str] = _parse_floats([v.translate(_PCT_JUNK) for v in values[is_str]])
+    elif pd.api.types.is_numeric_dtype(s):
+        x = s.to_numpy(dtype=float)
+    else:
+        # datetime dkk: bukan angka
+        x = np.full(len(s), np.nan)
+
+    return pd.Series(np.where(x > 1.5, x / 100, x), index=s.index, name=s.name)
+
+
+def to_number(s):
+    return pd.to_numeric(s, errors="coerce")
@@ -0,0 +1,383 @@
+# data/colcache.py
+import datetime as dt
+import hashlib
+import json
+import os
+import shutil
+import uuid
+from pathlib import Path
+
+import numpy as np
+import pyarrow as pa
+
+# naikkan kalau format file cache berubah
+CACHE_FORMAT = 2
+
+# jenis isi sel di kolom "kind"
+KIND_INT = 0
+KIND_FLOAT = 1
+KIND_STR = 2
+KIND_BOOL = 3
+KIND_DATETIME = 4
+KIND_TIME = 5
+KIND_TIMEDELTA = 6
+KIND_BIGINT = 7
+
+CELL_SCHEMA = pa.schema([
+    ("row", pa.int32()),
+    ("col", pa.int32()),
+    ("kind", pa.int8()),
+    ("int", pa.int64()),
+    ("num", pa.float64()),
+    ("text", pa.string()),
+    ("ts", pa.timestamp("us")),
+])
+
+
+# =====================================================
+# CONTENT HASH
+# =====================================================
+def file_sha256(path, chunk_size=1024 * 1024):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+# =====================================================
+# RAW GRID <-> ARROW TABLE
+# =====================================================
+def _classify(v):
+    """
+    Satu sel di luar jalur cepat rows_to_table -> (kind, lane, value).
+    """
+    if isinstance(v, str):
+        return KIND_STR, "text", v
+    if isinstance(v, bool):
+        return KIND_BOOL, "int", int(v)
+    if isinstance(v, int):
+        if -(2 ** 63) <= v < 2 ** 63:
+            return KIND_INT, "int", v
+        return KIND_BIGINT, "text", str(v)
+    if isinstance(v, float):
+        return KIND_FLOAT, "num", v
+    if isinstance(v, dt.datetime):
+        return KIND_DATETIME, "ts", v
+    if isinstance(v, dt.time):
+        return KIND_TIME, "text", v.isoformat()
+    if isinstance(v, dt.timedelta):
+        return KIND_TIMEDELTA, "num", v.total_seconds()
+    if isinstance(v, dt.date):
+        return KIND_DATETIME, "ts", dt.datetime(v.year, v.month, v.day)
+    return KIND_STR, "text", str(v)
+
+
+def rows_to_table(rows):
+    """
+    rows   : grid mentah (list[list]) dari data.sheetgrid.sheet_rows
+    return : pa.Table sparse, satu baris per sel yang terisi (urut baris, lalu kolom)
+
+    Jenis sel ditentukan per array (numpy), bukan per sel di loop Python;
+    loop cuma untuk tipe yang jarang (tanggal, jam, int di luar int64, dll).
+    """
+    n_rows = len(rows)
+    n_cols = len(rows[0]) if rows else 0
+
+    grid = np.empty((n_rows, n_cols), dtype=object)
+    for i, row in enumerate(rows):
+        grid[i, :] = row
+    cells = grid.ravel()
+    types = np.frompyfunc(type, 1, 1)(cells) if cells.size else cells
+
+    empty = cells == ""
+    kind = np.full(cells.size, -1, dtype=np.int8)
+    kind[(types == str) & ~empty] = KIND_STR
+    kind[types == float] = KIND_FLOAT
+    kind[types == bool] = KIND_BOOL
+
+    # int yang muat di int64; sisanya lewat _classify (BIGINT)
+    is_int = np.flatnonzero(types == int)
+    try:
+        ints = np.array(cells[is_int].tolist(), dtype=np.int64)
+    except OverflowError:
+        fits = np.array([-(2 ** 63) <= v < 2 ** 63 for v in cells[is_int]], dtype=bool)
+        is_int = is_int[fits]
+        ints = np.array(cells[is_int].tolist(), dtype=np.int64)
+    kind[is_int] = KIND_INT
+
+    fast = kind.copy()
+    other = np.flatnonzero((kind < 0) & ~empty)
+    classified = [_classify(v) for v in cells[other]]
+    if classified:
+        kind[other] = [k for k, _, _ in classified]
+
+    pos = np.flatnonzero(kind >= 0)
+    kind, fast = kind[pos], fast[pos]
+    n = len(pos)
+
+    lanes = {
+        "int": np.zeros(n, dtype=np.int64),
+        "num": np.zeros(n, dtype=np.float64),
+        "text": np.full(n, None, dtype=object),
+        "ts": np.zeros(n, dtype="datetime64[us]"),
+    }
+    filled = {name: np.zeros(n, dtype=bool) for name in lanes}
+
+    def put(lane, mask, values):
+        lanes[lane][mask] = values
+        filled[lane][mask] = True
+
+    put("int", fast == KIND_INT, ints)
+    m = fast == KIND_BOOL
+    put("int", m, cells[pos[m]].astype(np.int64))
+    m = fast == KIND_FLOAT
+    put("num", m, cells[pos[m]].astype(np.float64))
+    m = fast == KIND_STR
+    put("text", m, cells[pos[m]])
+
+    # sel bertipe jarang (hasil _classify) diisi satu per satu
+    at = np.searchsorted(pos, other)
+    for p, (_, lane, value) in zip(at, classified):
+        lanes[lane][p] = value
+        filled[lane][p] = True
+
+    table = pa.table({
+        "row": pa.array((pos // max(n_cols, 1)).astype(np.int32)),
+        "col": pa.array((pos % max(n_cols, 1)).astype(np.int32)),
+        "kind": pa.array(kind),
+        "int": pa.array(lanes["int"], mask=~filled["int"]),
+        "num": pa.array(lanes["num"], mask=~filled["num"]),
+        "text": pa.array(lanes["text"], type=pa.string()),
+        "ts": pa.array(lanes["ts"], mask=~filled["ts"]),
+    }, schema=CELL_SCHEMA)
+    return table.replace_schema_metadata({
+        "n_rows": str(n_rows),
+        "n_cols": str(n_cols),
+    })
+
+
+def table_shape(table):
+    """
+    return : (n_rows, n_cols) grid asli yang disimpan di tabel sel
+    """
+    meta = table.schema.metadata or {}
+    return int(meta.get(b"n_rows", 0)), int(meta.get(b"n_cols", 0))
+
+
+def table_to_grid(table):
+    """
+    Kebalikan rows_to_table: pa.Table -> np.ndarray object (n_rows, n_cols),
+    sel kosong = "".
+    """
+    n_rows, n_cols = table_shape(table)
+
+    grid = np.full((n_rows, n_cols), "", dtype=object)
+    if n_rows == 0 or table.num_rows == 0:
+        return grid
+
+    row = table.column("row").to_numpy()
+    col = table.column("col").to_numpy()
+    kind = table.column("kind").to_numpy()
+
+    def lane(name, mask):
+        arr = table.column(name).filter(pa.array(mask))
+        return arr.to_numpy(zero_copy_only=False)
+
+    m = kind == KIND_INT
+    if m.any():
+        grid[row[m], col[m]] = lane("int", m).astype(object)
+
+    m = kind == KIND_FLOAT
+    if m.any():
+        grid[row[m], col[m]] = lane("num", m).astype(object)
+
+    m = kind == KIND_STR
+    if m.any():
+        grid[row[m], col[m]] = lane("text", m)
+
+    m = kind == KIND_BOOL
+    if m.any():
+        grid[row[m], col[m]] = lane("int", m).astype(bool).astype(object)
+
+    m = kind == KIND_DATETIME
+    if m.any():
+        grid[row[m], col[m]] = table.column("ts").filter(pa.array(m)).to_pylist()
+
+    m = kind == KIND_TIME
+    if m.any():
+        grid[row[m], col[m]] = [dt.time.fromisoformat(s) for s in lane("text", m)]
+
+    m = kind == KIND_TIMEDELTA
+    if m.any():
+        grid[row[m], col[m]] = [dt.timedelta(seconds=s) for s in lane("num", m)]
+
+    m = kind == KIND_BIGINT
+    if m.any():
+        grid[row[m], col[m]] = [int(s) for s in lane("text", m)]
+
+    return grid
+
+
+def table_to_rows(table):
+    """
+    Kebalikan rows_to_table: pa.Table -> grid mentah (list[list]).
+    """
+    return table_to_grid(table).tolist()
+
+
+def table_to_ipc(table):
+    """
+    pa.Table -> bytes Arrow IPC (untuk dikirim antar proses).
+    """
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def ipc_to_table(data):
+    return pa.ipc.open_stream(pa.py_buffer(data)).read_all()
+
+
+# =====================================================
+# CACHE DI DISK (PER SHEET, KEY = DIGEST ISI SHEET)
+# =====================================================
+class ColumnarCache:
+    """
+    Cache grid mentah per sheet dalam format Arrow IPC (di-memory-map saat dibaca).
+
+    <cache_dir>/sheets/<sheet digest>.arrow     grid satu sheet
+    <cache_dir>/manifests/<file sha256>.json    urutan sheet + digest per file
+
+    Sheet yang isinya tidak berubah antar versi file memakai file .arrow
+    yang sama, jadi versi baru cuma menulis sheet yang berubah.
+    """
+
+    def __init__(self, cache_dir, keep_manifests=3):
+        self.cache_dir = Path(cache_dir)
+        self.keep_manifests = keep_manifests
+
+    @property
+    def _sheets_dir(self):
+        return self.cache_dir / "sheets"
+
+    @property
+    def _manifests_dir(self):
+        return self.cache_dir / "manifests"
+
+    def _write_atomic(self, target, write):
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_name(f".{target.name}.{uuid.uuid4().hex}.tmp")
+        try:
+            write(tmp)
+            os.replace(tmp, target)
+        finally:
+            if tmp.exists():
+                tmp.unlink()
+
+    # ---------- manifest per file ----------
+    def load_manifest(self, sha):
+        """
+        return : list [(sheet_name, digest)] atau None
+        """
+        try:
+            manifest = json.loads(
+                (self._manifests_dir / f"{sha}.json").read_text(encoding="utf-8")
+            )
+        except (OSError, ValueError):
+            return None
+        if manifest.get("format") != CACHE_FORMAT:
+            return None
+        return [(item["name"], item["digest"]) for item in manifest["sheets"]]
+
+    def store_manifest(self, sha, digests):
+        manifest = {
+            "format": CACHE_FORMAT,
+            "sha256": sha,
+            "sheets": [{"name": n, "digest": d} for n, d in digests.items()],
+        }
+        self._write_atomic(
+            self._manifests_dir / f"{sha}.json",
+            lambda tmp: tmp.write_text(json.dumps(manifest), encoding="utf-8")
+        )
+        self.prune()
+
+    # ---------- grid per sheet ----------
+    def load_sheet(self, digest):
+        """
+        return : pa.Table sel (rows_to_table) yang buffer-nya di-memory-map
+                 dari file .arrow, atau None
+        """
+        path = self._sheets_dir / f"{digest}.arrow"
+        if not path.exists():
+            return None
+        try:
+            with pa.memory_map(str(path), "r") as source:
+                return pa.ipc.open_file(source).read_all()
+        except Exception:
+            return None
+
+    def store_sheet(self, digest, table):
+        def write(tmp):
+            with pa.OSFile(str(tmp), "wb") as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+
+        self._write_atomic(self._sheets_dir / f"{digest}.arrow", write)
+
+    # ---------- seluruh workbook ----------
+    def load(self, sha):
+        """
+        return : dict {sheet_name: pa.Table} atau None kalau ada yang belum di-cache
+        """
+        entries = self.load_manifest(sha)
+        if entries is None:
+            return None
+
+        sheets = {}
+        for name, digest in entries:
+            table = self.load_sheet(digest)
+            if table is None:
+                return None
+            sheets[name] = table
+        return sheets
+
+    def store(self, sha, sheets, digests):
+        for name, table in sheets.items():
+            self.store_sheet(digests[name], table)
+        self.store_manifest(sha, {name: digests[name] for name in sheets})
+
+    def prune(self):
+        """
+        Simpan `keep_manifests` manifest terbaru, hapus grid sheet
+        yang tidak dirujuk manifest mana pun.
+        """
+        if not self._manifests_dir.exists():
+            return
+
+        # folder format lama (<sha256>/) tidak dipakai lagi
+        for path in self.cache_dir.iterdir():
+            if path.is_dir() and path.name not in ("sheets", "manifests"):
+                shutil.rmtree(path, ignore_errors=True)
+
+        manifests = sorted(
+            self._manifests_dir.glob("*.json"),
+            key=lambda p: p.stat().st_mtime,
+            reverse=True
+        )
+        keep = set()
+        for n, path in enumerate(manifests):
+            if n >= self.keep_manifests:
+                path.unlink(missing_ok=True)
+                continue
+            try:
+                manifest = json.loads(path.read_text(encoding="utf-8"))
+                keep.update(item["digest"] for item in manifest["sheets"])
+            except (OSError, ValueError, KeyError):
+                path.unlink(missing_ok=True)
+
+        if self._sheets_dir.exists():
+            for path in self._sheets_dir.glob("*.arrow"):
+                if path.stem not in keep:
+                    path.unlink(missing_ok=True)
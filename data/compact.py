@@ -0,0 +1,131 @@
+# data/compact.py
+"""
+Kompaksi kolom teks DataFrame yang disimpan di DatasetRegistry
+(data/registry.py). Dataset itu dipegang sekali per versi workbook untuk
+semua sesi, jadi kolom teks berulang adalah bagian terbesar memorinya.
+
+    dims   : kolom dimensi -> category (kalau nilai uniknya sedikit),
+             selain itu string di-intern
+    ids    : kolom identitas -> string di-intern (dtype tetap object)
+
+Kolom lain (angka) tidak disentuh.
+"""
+import sys
+import threading
+
+import numpy as np
+import pandas as pd
+
+def frame_bytes(df):
+    """
+    return : byte yang dipakai df (termasuk isi string), 0 kalau None.
+             Objek yang sama (string di-intern) dihitung sekali, beda
+             dengan memory_usage(deep=True) yang menghitung per sel.
+    """
+    if df is None:
+        return 0
+
+    total = int(df.index.memory_usage(deep=True))
+    for j in range(df.shape[1]):
+        s = df.iloc[:, j]
+        if s.dtype == object:
+            unique = {id(v): v for v in s.to_numpy()}
+            total += int(s.memory_usage(index=False, deep=False))
+            total += sum(sys.getsizeof(v) for v in unique.values())
+        else:
+            total += int(s.memory_usage(index=False, deep=True))
+    return total
+
+
+# =====================================================
+# PER KOLOM
+# =====================================================
+def intern_strings(s):
+    """
+    String yang sama jadi satu objek (sys.intern): hemat memori dan
+    pickle cukup menulis tiap string sekali.
+    """
+    if s.dtype != object or not len(s):
+        return s
+
+    values = s.to_numpy()
+    codes, uniques = pd.factorize(values)
+    pool = np.array(
+        [sys.intern(u) if type(u) is str else u for u in uniques] + [None],
+        dtype=object
+    )
+
+    out = pool[codes]
+    na = codes == -1
+    out[na] = values[na]     # NaN / None tetap apa adanya
+    return pd.Series(out, index=s.index, name=s.name, dtype=object)
+
+
+def to_category(s, max_ratio=0.5):
+    """
+    category kalau jumlah nilai unik <= max_ratio x jumlah baris,
+    selain itu cukup intern (category dengan banyak nilai unik tidak hemat).
+    """
+    if isinstance(s.dtype, pd.CategoricalDtype) or not len(s):
+        return s
+    if s.nunique(dropna=True) > max_ratio * len(s):
+        return intern_strings(s)
+    return s.astype("category")
+
+
+# =====================================================
+# PER FRAME
+# =====================================================
+def compact_frame(df, dims=(), ids=(), max_category_ratio=0.5):
+    """
+    df     : DataFrame hasil loader (tidak diubah)
+    return : DataFrame baru; kolom yang tidak disebut / tidak ada dibiarkan
+    """
+    if df is None or df.empty:
+        return df
+
+    cols = set(df.columns)
+    out = df.copy(deep=False)
+
+    for c in dims:
+        if c in cols:
+            out[c] = to_category(out[c], max_category_ratio)
+
+    for c in ids:
+        if c in cols:
+            out[c] = intern_strings(out[c])
+
+    return out
+
+
+# =====================================================
+# LAPORAN MEMORI
+# =====================================================
+class MemoryReport:
+    """
+    Byte sebelum / sesudah kompaksi per dataset (thread-safe).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._rows = {}
+
+    def record(self, name, rows, before, after):
+        with self._lock:
+            self._rows[name] = {
+                "dataset": name,
+                "rows": rows,
+                "before": before,
+                "after": after,
+            }
+
+    def rows(self):
+        with self._lock:
+            return [dict(r) for r in self._rows.values()]
+
+    def totals(self):
+        rows = self.rows()
+        return (
+            sum(r["before"] for r in rows),
+            sum(r["after"] for r in rows),
+        )
@@ -0,0 +1,119 @@
+# data/cube.py
+"""
+Cube agregat pangsa: satu baris per kombinasi dims unik (NaN ikut jadi
+kunci, seperti groupby dropna=False) x satu kolom per bulan, berisi
+sum / count / max nilai non-NaN. Dibangun sekali per versi workbook;
+page cukup memilih baris kunci lalu mereduksi satu bulan, tanpa melt.
+"""
+import numpy as np
+import pandas as pd
+
+
+class ShareCube:
+    """
+    keys     : DataFrame dims, RangeIndex 0..n_keys-1
+    months   : list nama kolom bulan (urutan kolom sheet)
+    sums, counts, maxs : ndarray (n_keys, n_months); maxs NaN kalau count 0
+    row_keys : ndarray posisi kunci per baris sumber (opsional)
+    """
+
+    def __init__(self, keys, months, sums, counts, maxs, row_keys=None):
+        self.keys = keys
+        self.row_keys = row_keys
+        self.months = list(months)
+        self.sums = sums
+        self.counts = counts
+        self.maxs = maxs
+        self._month_pos = {m: i for i, m in enumerate(self.months)}
+
+        # kode terurut per dim (-1 = NaN), urutan sama dengan groupby sort=True
+        self._codes = {c: pd.factorize(keys[c], sort=True) for c in keys.columns}
+
+    def __len__(self):
+        return len(self.keys)
+
+    def key_rows(self, source_rows):
+        """
+        source_rows : posisi baris frame sumber (mis. hasil FilterIndex.rows)
+        return      : posisi baris kunci cube yang memuat baris-baris itu
+        """
+        return np.unique(self.row_keys[source_rows])
+
+    def months_with_data(self, rows, max_share=None, months=None):
+        """
+        rows   : posisi baris kunci (hasil filter)
+        months : subset bulan yang diperiksa (None = semua)
+        return : bulan yang punya nilai di rows (dan max <= max_share)
+        """
+        months = self.months if months is None else [m for m in months if m in self._month_pos]
+        cols = [self._month_pos[m] for m in months]
+
+        has_data = self.counts[np.ix_(rows, cols)].sum(axis=0) > 0
+        if max_share is not None:
+            top = np.fmax.reduce(self.maxs[np.ix_(rows, cols)], axis=0, initial=-np.inf)
+            has_data &= top <= max_share
+        return [m for m, ok in zip(months, has_data) if ok]
+
+    def count(self, rows, months):
+        """
+        return : jumlah nilai non-NaN di rows x months
+        """
+        cols = [self._month_pos[m] for m in months]
+        return int(self.counts[np.ix_(rows, cols)].sum())
+
+    def mean_by(self, rows, month, by):
+        """
+        Rata-rata `month` per kombinasi `by`, sama dengan
+        melt -> dropna -> groupby(by, observed=True)["Share"].mean().
+
+        return : DataFrame kolom by + ["Share"]; kolom by yang category
+                 cuma membawa kategori yang muncul di hasil
+        """
+        j = self._month_pos[month]
+        rows = np.asarray(rows)
+
+        # kode gabungan by (mixed radix), baris kosong / kunci NaN dibuang
+        keep = self.counts[rows, j] > 0
+        group = np.zeros(len(rows), dtype=np.int64)
+        for c in by:
+            codes, uniques = self._codes[c]
+            keep &= codes[rows] >= 0
+            group = group * len(uniques) + codes[rows]
+
+        present, inverse = np.unique(group[keep], return_inverse=True)
+        sums = np.bincount(inverse, weights=self.sums[rows[keep], j], minlength=len(present))
+        counts = np.bincount(inverse, weights=self.counts[rows[keep], j], minlength=len(present))
+
+        out = {}
+        rest = present
+        for c in reversed(by):
+            uniques = self._codes[c][1]
+            out[c] = uniques.take(rest % len(uniques))
+            if isinstance(out[c].dtype, pd.CategoricalDtype):
+                out[c] = out[c].remove_unused_categories()
+            rest = rest // len(uniques)
+
+        frame = pd.DataFrame({c: out[c] for c in by})
+        frame["Share"] = sums / counts
+        return frame
+
+
+def build_share_cube(df, dims, months):
+    """
+    df     : DataFrame baris sumber (dims + kolom bulan float)
+    return : ShareCube
+    """
+    dims, months = list(dims), list(months)
+    codes = df.groupby(dims, dropna=False, observed=True, sort=False).ngroup().to_numpy()
+    first = np.unique(codes, return_index=True)[1]
+    keys = df[dims].iloc[first].reset_index(drop=True)
+
+    grouped = df[months].astype(float).groupby(codes, sort=True)
+    return ShareCube(
+        keys,
+        months,
+        grouped.sum().to_numpy(),
+        grouped.count().to_numpy(),
+        grouped.max().to_numpy(),
+        row_keys=codes,
+    )
@@ -0,0 +1,472 @@
+# data/download.py
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import uuid
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+import requests
+
+from data.colcache import file_sha256
+
+try:
+    import fcntl
+except ImportError:     # Windows
+    fcntl = None
+    import msvcrt
+
+
+# =====================================================
+# SIDECAR METADATA (<file>.meta.json)
+# =====================================================
+def meta_path(path):
+    path = Path(path)
+    return path.with_name(path.name + ".meta.json")
+
+
+def read_meta(path):
+    try:
+        return json.loads(meta_path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def write_meta(path, meta):
+    target = meta_path(path)
+    tmp = target.with_name(f".{target.name}.{uuid.uuid4().hex}.tmp")
+    tmp.write_text(json.dumps(meta, indent=2), encoding="utf-8")
+    os.replace(tmp, target)
+
+
+# =====================================================
+# VALIDASI XLSX (ZIP CENTRAL DIRECTORY)
+# =====================================================
+def validate_xlsx(path):
+    """
+    Pastikan file adalah zip utuh berisi workbook Excel.
+    File terpotong tidak punya central directory -> BadZipFile.
+    """
+    try:
+        with zipfile.ZipFile(path) as zf:
+            names = set(zf.namelist())
+    except zipfile.BadZipFile as e:
+        raise RuntimeError(f"Downloaded file is not a valid xlsx: {e}") from e
+
+    if "xl/workbook.xml" not in names:
+        raise RuntimeError("Downloaded file is a zip but not an Excel workbook")
+
+
+# =====================================================
+# CONDITIONAL + ATOMIC DOWNLOAD
+# =====================================================
+def _source_url(url, params):
+    return requests.Request("GET", url, params=params).prepare().url
+
+
+def _conditional_headers(dest, source):
+    """
+    Header If-None-Match / If-Modified-Since, hanya kalau file lokal
+    masih cocok dengan sidecar (hash sama, sumber sama).
+    """
+    dest = Path(dest)
+    if not dest.exists():
+        return {}
+
+    meta = read_meta(dest)
+    if meta.get("source") != source or not meta.get("sha256"):
+        return {}
+    if file_sha256(dest) != meta["sha256"]:
+        return {}
+
+    headers = {}
+    if meta.get("etag"):
+        headers["If-None-Match"] = meta["etag"]
+    if meta.get("last_modified"):
+        headers["If-Modified-Since"] = meta["last_modified"]
+    return headers
+
+
+def _check_response(r):
+    if r.status_code not in (200, 206):
+        raise RuntimeError(f"Download failed ({r.status_code})")
+
+    # 🔥 VALIDASI MIME TYPE
+    content_type = r.headers.get("Content-Type", "")
+    if "text/html" in content_type.lower():
+        raise RuntimeError(
+            "Google Drive returned HTML, not Excel. "
+            "Check sharing permission (must be Anyone with link → Viewer)"
+        )
+
+
+def _total_size(r):
+    # Content-Range: bytes 0-0/12345
+    m = re.match(r"bytes \d+-\d+/(\d+)", r.headers.get("Content-Range", ""))
+    return int(m.group(1)) if m else None
+
+
+def _download_stream(r, dest, chunk_size):
+    """
+    Satu stream berurutan ke file sementara unik.
+    return : (tmp_path, resumed_bytes)
+    """
+    tmp = dest.with_name(f".{dest.name}.{uuid.uuid4().hex}.part")
+    try:
+        with open(tmp, "wb") as f:
+            for chunk in r.iter_content(chunk_size):
+                if chunk:
+                    f.write(chunk)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    return tmp, 0
+
+
+def _download_single(http, url, params, dest, timeout, chunk_size):
+    """
+    GET biasa tanpa Range / header conditional, satu stream.
+    return : (tmp_path, etag, last_modified)
+    """
+    r = http.get(url, params=params, stream=True, timeout=timeout)
+    try:
+        _check_response(r)
+        tmp, _ = _download_stream(r, dest, chunk_size)
+    finally:
+        r.close()
+    return tmp, r.headers.get("ETag"), r.headers.get("Last-Modified")
+
+
+# =====================================================
+# RANGED + PARALLEL + RESUMABLE
+# =====================================================
+class _SourceChanged(Exception):
+    """
+    File di server berubah di tengah download per potongan.
+    """
+
+
+def _strong_etag(etag):
+    # ETag lemah (W/"...") tidak boleh dipakai di If-Range dan tidak
+    # menjamin isi byte yang sama
+    if etag is None or etag.startswith("W/"):
+        return None
+    return etag
+
+
+def _part_paths(dest, etag, total):
+    """
+    File potongan per versi sumber (ETag + ukuran): download versi lain
+    tidak pernah menulis ke file yang sama.
+    """
+    key = hashlib.sha1(f"{etag}|{total}".encode("utf-8")).hexdigest()[:16]
+    part = dest.with_name(f".{dest.name}.{key}.part")
+    return part, part.with_name(part.name + ".json"), part.with_name(part.name + ".lock")
+
+
+def _prune_parts(dest):
+    """
+    Hapus file potongan (.part / .part.json / .part.lock) semua versi
+    sumber, kecuali yang kuncinya sedang dipegang proses lain.
+    """
+    pattern = re.compile(re.escape(f".{dest.name}.") + r"([0-9a-f]{16})\.part")
+    keys = {
+        m.group(1)
+        for m in (pattern.match(p.name) for p in dest.parent.iterdir())
+        if m is not None
+    }
+    for key in keys:
+        part = dest.with_name(f".{dest.name}.{key}.part")
+        lock_path = part.with_name(part.name + ".lock")
+        held = _try_lock(lock_path)
+        if held is None:
+            continue
+        try:
+            part.unlink(missing_ok=True)
+            part.with_name(part.name + ".json").unlink(missing_ok=True)
+        finally:
+            held.close()
+        try:
+            lock_path.unlink(missing_ok=True)
+        except OSError:
+            # Windows: kunci baru saja dibuka proses lain, biarkan
+            pass
+
+
+def _try_lock(path):
+    """
+    Kunci eksklusif tanpa menunggu; dilepas otomatis kalau proses mati.
+    return : file handle yang memegang kunci, None kalau dipegang proses lain
+    """
+    f = open(path, "a+b")
+    try:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+    except OSError:
+        f.close()
+        return None
+    return f
+
+
+def _download_ranged(http, url, params, dest, total, etag, timeout,
+                     part_size, workers, retries=2):
+    """
+    Download paralel per potongan `part_size` byte (HTTP Range).
+    Potongan yang sudah selesai dicatat di <.part>.json, jadi download
+    yang putus dilanjutkan dari potongan terakhir yang lengkap.
+
+    File potongan dikunci selama dipakai. Tanpa ETag kuat, atau kalau
+    proses / replika lain sedang memegangnya, download memakai file
+    sementara unik (tanpa resume) supaya tulisan potongan tidak bercampur.
+
+    return : (tmp_path, resumed_bytes)
+    raise  : _SourceChanged kalau file berubah di tengah jalan
+             (file potongan sudah dibuang)
+    """
+    held = None
+    if _strong_etag(etag) is not None:
+        part, progress_path, lock_path = _part_paths(dest, etag, total)
+        held = _try_lock(lock_path)
+    if held is None:
+        part = dest.with_name(f".{dest.name}.{uuid.uuid4().hex}.part")
+        progress_path = None
+
+    try:
+        resumed = _fetch_parts(
+            http, url, params, part, progress_path, total, etag, timeout,
+            part_size, workers, retries
+        )
+        if held is None:
+            return part, resumed
+
+        # pindah ke nama unik sebelum kunci dilepas: file ini milik pemanggil
+        tmp = dest.with_name(f".{dest.name}.{uuid.uuid4().hex}.part")
+        os.replace(part, tmp)
+        progress_path.unlink(missing_ok=True)
+        return tmp, resumed
+    except _SourceChanged:
+        # potongan versi lama tidak berguna lagi
+        part.unlink(missing_ok=True)
+        if progress_path is not None:
+            progress_path.unlink(missing_ok=True)
+        raise
+    except BaseException:
+        if held is None:
+            part.unlink(missing_ok=True)
+        raise
+    finally:
+        if held is not None:
+            held.close()
+
+
+def _fetch_parts(http, url, params, part, progress_path, total, etag, timeout,
+                 part_size, workers, retries):
+    """
+    progress_path : None = tanpa catatan progres (file sementara sekali pakai)
+    return        : byte yang dilanjutkan dari download sebelumnya
+    """
+    n_parts = (total + part_size - 1) // part_size
+
+    progress = {}
+    if progress_path is not None and part.exists() and progress_path.exists():
+        try:
+            progress = json.loads(progress_path.read_text(encoding="utf-8"))
+        except ValueError:
+            progress = {}
+
+    same_file = (
+        progress.get("etag") == etag
+        and progress.get("size") == total
+        and progress.get("part_size") == part_size
+        and _strong_etag(etag) is not None
+    )
+    done = set(progress.get("done", [])) if same_file else set()
+
+    if not done:
+        with open(part, "wb") as f:
+            f.truncate(total)
+
+    resumed = sum(min(part_size, total - i * part_size) for i in done)
+    lock = threading.Lock()
+
+    def save_progress():
+        if progress_path is None:
+            return
+        tmp = progress_path.with_name(f".{progress_path.name}.{uuid.uuid4().hex}.tmp")
+        tmp.write_text(json.dumps({
+            "etag": etag,
+            "size": total,
+            "part_size": part_size,
+            "done": sorted(done),
+        }), encoding="utf-8")
+        os.replace(tmp, progress_path)
+
+    def fetch_part(i):
+        start = i * part_size
+        end = min(start + part_size, total) - 1
+        headers = {"Range": f"bytes={start}-{end}"}
+        if _strong_etag(etag):
+            # file berubah di tengah jalan -> server kirim 200, bukan 206
+            headers["If-Range"] = etag
+
+        last_error = None
+        for _ in range(retries + 1):
+            try:
+                r = http.get(url, params=params, headers=headers, stream=True, timeout=timeout)
+                try:
+                    if r.status_code == 200:
+                        raise _SourceChanged("Range request returned the whole file")
+                    if r.status_code != 206:
+                        raise RuntimeError(f"Range request failed ({r.status_code})")
+                    if _total_size(r) != total or r.headers.get("ETag", etag) != etag:
+                        # tanpa If-Range (ETag lemah) perubahan terlihat di sini
+                        raise _SourceChanged("Range request returned another version")
+                    content = r.content
+                finally:
+                    r.close()
+                if len(content) != end - start + 1:
+                    raise RuntimeError("Range request returned a short body")
+
+                with open(part, "r+b") as f:
+                    f.seek(start)
+                    f.write(content)
+
+                with lock:
+                    done.add(i)
+                    save_progress()
+                return
+            except (requests.RequestException, RuntimeError) as e:
+                last_error = e
+        raise last_error
+
+    todo = [i for i in range(n_parts) if i not in done]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(fetch_part, i) for i in todo]
+        try:
+            for future in as_completed(futures):
+                future.result()
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+
+    return resumed
+
+
+# =====================================================
+# CONDITIONAL + ATOMIC DOWNLOAD
+# =====================================================
+def fetch_workbook(url, dest, params=None, session=None, timeout=120,
+                   chunk_size=1024 * 1024, workers=4, part_size=4 * 1024 * 1024):
+    """
+    Download workbook ke `dest` kalau berubah di server.
+
+    - request conditional (ETag / Last-Modified dari sidecar)
+    - kalau server mendukung Range: download paralel per potongan
+      (`workers` thread) dan bisa dilanjutkan kalau putus;
+      kalau tidak, atau file berubah di tengah jalan: satu stream berurutan
+    - validasi zip di file sementara, lalu os.replace (atomic)
+      -> pembaca tidak pernah lihat file setengah jadi
+    - sidecar <dest>.meta.json: etag, last_modified, sha256, size,
+      dan statistik download terakhir
+
+    return : dict statistik {"mode", "changed", "bytes", "seconds", "bytes_per_sec", ...}
+    """
+    dest = Path(dest)
+    dest.parent.mkdir(parents=True, exist_ok=True)
+
+    http = session or requests
+    source = _source_url(url, params)
+    t0 = time.perf_counter()
+
+    headers = _conditional_headers(dest, source)
+    if workers > 1:
+        # probe 1 byte: sekaligus cek dukungan Range & ukuran file
+        headers["Range"] = "bytes=0-0"
+
+    r = http.get(url, params=params, headers=headers, stream=True, timeout=timeout)
+
+    try:
+        if r.status_code == 304:
+            return {
+                "mode": "not-modified",
+                "changed": False,
+                "bytes": 0,
+                "seconds": time.perf_counter() - t0,
+                "bytes_per_sec": 0.0,
+            }
+
+        _check_response(r)
+
+        etag = r.headers.get("ETag")
+        last_modified = r.headers.get("Last-Modified")
+        total = _total_size(r) if r.status_code == 206 else None
+
+        if r.status_code == 206 and total is None:
+            # Range didukung tapi ukuran tidak diketahui -> ulang tanpa Range;
+            # probe sudah bilang file berubah, jadi tanpa header conditional juga
+            # (304 di sini bukan jawaban yang sah)
+            r.close()
+            r = http.get(url, params=params, stream=True, timeout=timeout)
+            _check_response(r)
+
+        if total is not None:
+            r.close()
+            mode = "ranged"
+            try:
+                tmp, resumed = _download_ranged(
+                    http, url, params, dest, total, etag, timeout,
+                    part_size=part_size, workers=workers
+                )
+            except _SourceChanged:
+                # file berubah di tengah download: ulang dari awal, satu stream
+                mode = "single"
+                resumed = 0
+                tmp, etag, last_modified = _download_single(
+                    http, url, params, dest, timeout, chunk_size
+                )
+        else:
+            mode = "single"
+            tmp, resumed = _download_stream(r, dest, chunk_size)
+    finally:
+        r.close()
+
+    try:
+        validate_xlsx(tmp)
+        sha = file_sha256(tmp)
+        size = tmp.stat().st_size
+        os.replace(tmp, dest)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+    # potongan versi sumber lain (atau sisa download ini) tidak berguna lagi
+    _prune_parts(dest)
+
+    seconds = time.perf_counter() - t0
+    fetched = size - resumed
+    stats = {
+        "mode": mode,
+        "changed": True,
+        "bytes": fetched,
+        "resumed_bytes": resumed,
+        "seconds": seconds,
+        "bytes_per_sec": fetched / seconds if seconds > 0 else 0.0,
+    }
+
+    write_meta(dest, {
+        "source": source,
+        "etag": etag,
+        "last_modified": last_modified,
+        "sha256": sha,
+        "size": size,
+        "last_download": stats,
+    })
+    return stats
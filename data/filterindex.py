@@ -0,0 +1,108 @@
+# data/filterindex.py
+"""
+Index filter sidebar untuk satu DataFrame, dibangun sekali per versi
+workbook. Per dim (Pulau / Provinsi / Route) disimpan posting: posisi
+baris (urut) per nilai. Di RevbyKab baris satu Pulau / Provinsi memang
+bersebelahan, jadi posting-nya praktis satu rentang.
+
+Filter = gabungan posting nilai terpilih per dim, lalu irisan antar dim;
+tidak ada scan isin ke seluruh frame. Daftar opsi anak (mis. Provinsi
+untuk Pulau terpilih) di-cache per seleksi induk.
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+
+class FilterIndex:
+    """
+    df   : DataFrame sumber (tidak disimpan)
+    dims : kolom yang bisa difilter; yang tidak ada di df dilewati
+    """
+
+    def __init__(self, df, dims, max_cached=128):
+        self.n_rows = len(df)
+        self.dims = [c for c in dims if c in df.columns]
+        self.max_cached = max_cached
+
+        self._codes = {}
+        self._values = {}
+        self._lookup = {}
+        self._postings = {}
+        self._options = {}
+        for c in self.dims:
+            codes, uniques = pd.factorize(df[c])
+            order = np.argsort(codes, kind="stable")
+            bounds = np.cumsum(np.bincount(codes[codes >= 0], minlength=len(uniques)))
+            start = int(np.count_nonzero(codes < 0))   # NaN di depan, tidak punya posting
+
+            values = uniques.tolist()
+            self._codes[c] = codes
+            self._values[c] = values
+            self._lookup[c] = {v: i for i, v in enumerate(values)}
+            self._postings[c] = np.split(order[start:], bounds[:-1])
+            self._options[c] = sorted(values)
+
+        self._lock = threading.Lock()
+        self._child_options = OrderedDict()
+
+    # =====================================================
+    # OPSI
+    # =====================================================
+    def options(self, dim, within=None):
+        """
+        within : (dim_induk, nilai terpilih) -> opsi `dim` yang muncul di
+                 baris induk terpilih; None / seleksi kosong = semua opsi
+        return : list nilai non-NaN, urut
+        """
+        if dim not in self._options:
+            return []
+        if not within or not within[1] or within[0] not in self._options:
+            return list(self._options[dim])
+
+        parent, selected = within
+        key = (dim, parent, frozenset(selected))
+        with self._lock:
+            if key in self._child_options:
+                self._child_options.move_to_end(key)
+                return list(self._child_options[key])
+
+        codes = self._codes[dim][self._union(parent, selected)]
+        values = self._values[dim]
+        opts = sorted(values[i] for i in np.unique(codes[codes >= 0]))
+
+        with self._lock:
+            self._child_options[key] = opts
+            while len(self._child_options) > self.max_cached:
+                self._child_options.popitem(last=False)
+        return list(opts)
+
+    # =====================================================
+    # BARIS
+    # =====================================================
+    def _union(self, dim, selected):
+        lookup = self._lookup[dim]
+        postings = self._postings[dim]
+        parts = [postings[lookup[v]] for v in selected if v in lookup]
+        if not parts:
+            return np.empty(0, dtype=np.intp)
+        if len(parts) == 1:
+            return parts[0]
+        return np.sort(np.concatenate(parts))
+
+    def rows(self, selections):
+        """
+        selections : dict {dim: nilai terpilih}; seleksi kosong / dim yang
+                     tidak diindex = tanpa filter (baris NaN ikut)
+        return     : posisi baris lolos filter (urut), sama dengan
+                     df[dim].isin(nilai) berturut-turut per dim
+        """
+        out = None
+        for dim, selected in selections.items():
+            if not selected or dim not in self._postings:
+                continue
+            rows = self._union(dim, selected)
+            out = rows if out is None else np.intersect1d(out, rows, assume_unique=True)
+        return np.arange(self.n_rows) if out is None else out
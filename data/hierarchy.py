@@ -0,0 +1,89 @@
+# data/hierarchy.py
+"""
+Pulihkan hierarki dari export pivot Excel yang "grouped rows":
+baris header grup cuma punya satu sel teks (mis. "JAWA", lalu
+"JAWA BARAT"), baris data di bawahnya tidak mengulang label grupnya.
+
+Semua per kolom / per matriks, tanpa loop per baris.
+"""
+import numpy as np
+import pandas as pd
+
+from data.cleaning import to_text
+
+
+def text_matrix(df):
+    """
+    return : ndarray object (rows x cols), isi = string yang sudah di-strip,
+             NaN untuk sel kosong / bukan string
+    """
+    if not len(df.columns):
+        return np.empty((len(df), 0), dtype=object)
+    return np.column_stack([
+        to_text(df.iloc[:, j]).to_numpy(dtype=object)
+        for j in range(len(df.columns))
+    ])
+
+
+def group_header_mask(text):
+    """
+    text   : hasil text_matrix
+    return : (mask baris header grup, label header per baris (upper) / None)
+
+    Baris header grup = tepat satu sel teks terisi.
+    """
+    filled = pd.notna(text)
+    is_header = filled.sum(axis=1) == 1
+
+    labels = np.full(len(text), None, dtype=object)
+    if is_header.any():
+        rows = np.flatnonzero(is_header)
+        cells = text[rows, filled[rows].argmax(axis=1)]
+        labels[rows] = [v.upper() for v in cells]
+    return is_header, labels
+
+
+def _assign(df, col, mask, values):
+    # kolom dibuat / di-upcast ke object hanya kalau memang ada yang diisi
+    if not mask.any():
+        return
+    if col not in df.columns:
+        df[col] = np.nan
+    if df[col].dtype != object:
+        df[col] = df[col].astype(object)
+    df.iloc[np.flatnonzero(mask), df.columns.get_loc(col)] = values[mask]
+
+
+def recover_hierarchy(df, top_values, levels=("Pulau", "Provinsi")):
+    """
+    df         : DataFrame grid pivot (index 0..n-1), diubah in-place
+    top_values : label level atas (mis. nama pulau, upper-case)
+    levels     : (kolom level atas, kolom level bawah)
+    return     : df
+
+    Header yang labelnya ada di top_values membuka grup level atas baru
+    (dan menutup level bawah); header lain membuka grup level bawah.
+    Baris non-header diisi label grup yang sedang aktif; baris header
+    sendiri tidak diubah.
+    """
+    if df is None or df.empty:
+        return df
+
+    is_header, labels = group_header_mask(text_matrix(df))
+    is_top = is_header & pd.Series(labels).isin(top_values).to_numpy()
+    is_sub = is_header & ~is_top
+
+    # forward-fill label grup; "" = level bawah ditutup oleh header level atas
+    top = pd.Series(np.where(is_top, labels, None)).ffill().to_numpy()
+    sub = pd.Series(np.where(is_sub, labels, np.where(is_top, "", None))).ffill().to_numpy()
+
+    is_data = ~is_header
+    writes = [
+        (levels[0], is_data & pd.notna(top), top),
+        (levels[1], is_data & pd.notna(sub) & (sub != ""), sub),
+    ]
+    # kolom yang belum ada dibuat sesuai urutan baris pertama yang diisi
+    writes.sort(key=lambda w: w[1].argmax() if w[1].any() else len(df))
+    for col, mask, values in writes:
+        _assign(df, col, mask, values)
+    return df
@@ -0,0 +1,166 @@
+# data/pivotcache.py
+"""
+Baca fact table di balik pivot table langsung dari part xlsx
+(pivotCacheDefinition + pivotCacheRecords), tanpa mem-parse layout
+pivot yang sudah di-render di sheet.
+"""
+import zipfile
+import xml.etree.ElementTree as ET
+
+import numpy as np
+import pandas as pd
+
+from data.xlsxparts import NS_MAIN, NS_REL, read_rels, sheet_parts
+
+REL_PIVOT_TABLE = "/pivotTable"
+REL_PIVOT_CACHE = "/pivotCacheDefinition"
+REL_PIVOT_RECORDS = "/pivotCacheRecords"
+
+
+# =====================================================
+# NILAI SEL CACHE
+# =====================================================
+def _number(v):
+    x = float(v)
+    return int(x) if x.is_integer() else x
+
+
+def _item_value(el):
+    """
+    Satu item cache (<n>, <s>, <d>, <b>, <e>, <m>) -> nilai Python.
+    """
+    tag = el.tag[len(NS_MAIN):]
+    v = el.get("v")
+    if tag == "n":
+        return _number(v)
+    if tag == "s":
+        return v or ""
+    if tag == "d":
+        return pd.Timestamp(v)
+    if tag == "b":
+        return v in ("1", "true")
+    if tag == "e":
+        return np.nan
+    return None     # <m/> = kosong
+
+
+# =====================================================
+# DEFINITION
+# =====================================================
+def _read_definition(zf, part):
+    root = ET.fromstring(zf.read(part))
+
+    source = root.find(f"{NS_MAIN}cacheSource/{NS_MAIN}worksheetSource")
+    fields = []
+    for field in root.iter(f"{NS_MAIN}cacheField"):
+        # field hasil grouping / formula tidak ada di records
+        if field.get("databaseField", "1") in ("0", "false"):
+            continue
+        shared = field.find(f"{NS_MAIN}sharedItems")
+        items = [_item_value(el) for el in shared] if shared is not None else []
+        fields.append({"name": field.get("name"), "items": items})
+
+    records = None
+    for target, rel_type in read_rels(zf, part).values():
+        if rel_type.endswith(REL_PIVOT_RECORDS):
+            records = target
+
+    return {
+        "part": part,
+        "records_part": records,
+        "source_sheet": source.get("sheet") if source is not None else None,
+        "source_ref": source.get("ref") if source is not None else None,
+        "source_name": source.get("name") if source is not None else None,
+        "n_records": int(root.get("recordCount", 0)),
+        "fields": fields,
+        "pivot_tables": [],
+    }
+
+
+def pivot_caches(path):
+    """
+    return : list dict per pivot cache, urutan sesuai <pivotCaches> di workbook.xml:
+             {"part", "records_part", "source_sheet", "source_ref",
+              "source_name", "n_records", "fields", "pivot_tables"}
+             pivot_tables = list (sheet_name, nama pivot table) yang memakai cache itu
+    """
+    with zipfile.ZipFile(path) as zf:
+        names = set(zf.namelist())
+
+        rels = read_rels(zf, "xl/workbook.xml")
+        workbook = ET.fromstring(zf.read("xl/workbook.xml"))
+
+        caches = {}
+        for el in workbook.iter(f"{NS_MAIN}pivotCache"):
+            target, rel_type = rels.get(el.get(f"{NS_REL}id"), (None, ""))
+            if rel_type.endswith(REL_PIVOT_CACHE) and target in names:
+                caches[target] = _read_definition(zf, target)
+
+        for sheet_name, sheet_part in sheet_parts(zf):
+            for table_part, rel_type in read_rels(zf, sheet_part).values():
+                if not rel_type.endswith(REL_PIVOT_TABLE) or table_part not in names:
+                    continue
+                table_name = ET.fromstring(zf.read(table_part)).get("name")
+                for target, t in read_rels(zf, table_part).values():
+                    if t.endswith(REL_PIVOT_CACHE) and target in caches:
+                        caches[target]["pivot_tables"].append((sheet_name, table_name))
+
+    return list(caches.values())
+
+
+# =====================================================
+# RECORDS -> FACT TABLE
+# =====================================================
+def read_pivot_records(path, cache):
+    """
+    cache  : satu dict dari pivot_caches()
+    return : DataFrame fact table, satu baris per record, kolom = cacheField
+    """
+    fields = cache["fields"]
+    columns = [[] for _ in fields]
+
+    if cache["records_part"] is not None:
+        with zipfile.ZipFile(path) as zf, zf.open(cache["records_part"]) as f:
+            for _, el in ET.iterparse(f):
+                if el.tag != f"{NS_MAIN}r":
+                    continue
+                for i, item in enumerate(el):
+                    if i >= len(fields):
+                        break
+                    if item.tag == f"{NS_MAIN}x":
+                        # index ke sharedItems field ini
+                        value = fields[i]["items"][int(item.get("v", 0))]
+                    else:
+                        value = _item_value(item)
+                    columns[i].append(value)
+                el.clear()
+
+    return pd.DataFrame({
+        field["name"]: pd.Series(col, dtype=object).infer_objects()
+        for field, col in zip(fields, columns)
+    })
+
+
+def find_pivot_cache(path, sheet_name):
+    """
+    Pivot cache yang dipakai pivot table di `sheet_name`
+    (atau yang sumber datanya sheet itu).
+    """
+    caches = pivot_caches(path)
+    for cache in caches:
+        if any(s == sheet_name for s, _ in cache["pivot_tables"]):
+            return cache
+    for cache in caches:
+        if cache["source_sheet"] == sheet_name:
+            return cache
+    return None
+
+
+def read_pivot_facts(path, sheet_name):
+    """
+    return : DataFrame fact table di balik pivot di `sheet_name`
+    """
+    cache = find_pivot_cache(path, sheet_name)
+    if cache is None:
+        raise ValueError(f"No pivot cache found for worksheet '{sheet_name}'")
+    return read_pivot_records(path, cache)
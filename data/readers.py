@@ -0,0 +1,94 @@
+# data/readers.py
+"""
+Backend pembaca sheet di belakang config.load_excel.
+
+Semua backend punya method yang sama:
+
+    read(snapshot, sheet_name=0, **kwargs) -> DataFrame / dict {sheet: DataFrame}
+
+dengan argumen seperti pd.read_excel. `snapshot` adalah WorkbookSnapshot
+yang sedang dilayani; backend berbasis file cuma memakai snapshot.path
+(versinya jadi bagian key cache di config.load_excel) dan tidak pernah
+memicu parse grid snapshot.
+"""
+import importlib.util
+
+import pandas as pd
+
+
+class SnapshotReader:
+    """
+    Grid mentah dari WorkbookSnapshot (parse sekali + cache kolumnar Arrow).
+    """
+
+    name = "snapshot"
+
+    def read(self, snapshot, sheet_name=0, **kwargs):
+        return snapshot.read(sheet_name=sheet_name, **kwargs)
+
+
+class OpenpyxlReader:
+    """
+    pd.read_excel langsung dari file, engine openpyxl (perilaku lama).
+    """
+
+    name = "openpyxl"
+    engine = "openpyxl"
+
+    def read(self, snapshot, sheet_name=0, **kwargs):
+        return pd.read_excel(
+            snapshot.path,
+            sheet_name=sheet_name,
+            engine=self.engine,
+            **kwargs
+        )
+
+
+class CalamineReader(OpenpyxlReader):
+    """
+    pd.read_excel dengan engine calamine (reader native, Rust).
+    Butuh python-calamine (ada di requirements.txt).
+
+    Catatan: sel berisi spasi saja jadi NaN (openpyxl: string spasi),
+    jadi hasilnya tidak selalu identik -> cek dulu dengan `bench.py backends`.
+    """
+
+    name = "calamine"
+    engine = "calamine"
+
+    def __init__(self):
+        if importlib.util.find_spec("python_calamine") is None:
+            raise ImportError(
+                "Reader backend 'calamine' needs python-calamine "
+                "(pip install -r requirements.txt)"
+            )
+
+
+READERS = {
+    cls.name: cls
+    for cls in (SnapshotReader, OpenpyxlReader, CalamineReader)
+}
+
+
+def available_readers():
+    """
+    return : list nama backend yang bisa dipakai di environment ini
+    """
+    names = []
+    for name, cls in READERS.items():
+        try:
+            cls()
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+def get_reader(name):
+    try:
+        cls = READERS[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown reader backend '{name}' (choose from: {', '.join(READERS)})"
+        ) from None
+    return cls()
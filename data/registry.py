@@ -0,0 +1,125 @@
+# data/registry.py
+"""
+Dataset read-only yang dibagi semua sesi (dipegang lewat st.cache_resource).
+
+st.cache_data mem-pickle hasil saat disimpan dan meng-unpickle salinan
+utuh di setiap hit. Registry ini menyimpan satu objek saja; pemanggil
+dapat salinan dangkal (DataFrame baru, data numpy yang sama).
+
+Mengganti / menambah kolom di salinan itu (df[c] = ...) selalu memasang
+array baru di salinan saja, jadi frame di registry tidak ikut berubah.
+Array di balik frame yang disimpan dibuat read-only (freeze), jadi tulis
+in-place (df.loc[...] = ..., df.iloc[...] = ..., df.values[...] = ...)
+gagal dengan ValueError, bukan diam-diam mengubah data semua sesi;
+.copy() dulu kalau memang perlu menulis.
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from data.singleflight import SingleFlight
+
+
+def _freeze_array(values):
+    # ndarray, atau array ekstensi di atas ndarray (Categorical, datetime, Int64...)
+    for arr in (
+        values,
+        getattr(values, "_ndarray", None),
+        getattr(values, "_data", None),
+        getattr(values, "_mask", None),
+    ):
+        if isinstance(arr, np.ndarray):
+            arr.flags.writeable = False
+
+
+def freeze(value):
+    """
+    Jadikan read-only array blok DataFrame / Series / ndarray di value
+    (tuple / list / dict ditelusuri, nilai lain apa adanya).
+
+    return : value (objek yang sama)
+    """
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        for values in value._mgr.arrays:
+            _freeze_array(values)
+    elif isinstance(value, np.ndarray):
+        _freeze_array(value)
+    elif isinstance(value, (tuple, list)):
+        for v in value:
+            freeze(v)
+    elif isinstance(value, dict):
+        for v in value.values():
+            freeze(v)
+    return value
+
+
+def share(value):
+    """
+    Salinan dangkal untuk pemanggil: DataFrame / Series baru di atas
+    data yang sama; tuple / list / dict ditelusuri, nilai lain apa adanya.
+    """
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.copy(deep=False)
+    if isinstance(value, tuple):
+        return tuple(share(v) for v in value)
+    if isinstance(value, list):
+        return [share(v) for v in value]
+    if isinstance(value, dict):
+        return {k: share(v) for k, v in value.items()}
+    return value
+
+
+class DatasetRegistry:
+    """
+    key -> dataset, LRU maksimal max_entries. Key harus memuat versi
+    workbook supaya versi lama keluar sendiri lewat LRU.
+
+    Build untuk key yang sama cuma jalan sekali walau banyak sesi
+    meminta bersamaan (SingleFlight).
+    """
+
+    def __init__(self, max_entries=64, flight=None):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._flight = flight or SingleFlight()
+        self.hits = 0
+        self.builds = 0
+
+    def get(self, key, build):
+        """
+        build  : function() -> dataset, dipanggil kalau key belum ada
+        return : share(dataset)
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return share(self._entries[key])
+
+        value = self._flight.do(("registry", key), lambda: self._build(key, build))
+        return share(value)
+
+    def _build(self, key, build):
+        value = freeze(build())
+        with self._lock:
+            self.builds += 1
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "builds": self.builds,
+            }
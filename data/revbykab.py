@@ -1,97 +1,184 @@
 import pandas as pd
 import numpy as np
 import re
+import streamlit as st
+
+from config import (
+    PULAU_NAMES,
+    REVKAB_DIMS,
+    SHEET_NAME_REVKAB,
+    SHEET_SCHEMAS,
+    compact_dataset,
+    load_excel,
+    shared_dataset,
+)
+from data.cleaning import dim_label, ffill_text, to_upper
+from data.cube import build_share_cube
+from data.filterindex import FilterIndex
+from data.hierarchy import recover_hierarchy
+from data.schema import read_schema
 
 # =====================================================
 # Helper: recover hierarchy from Excel-style grouped rows
 # =====================================================
 def recover_hierarchy_from_rows(df):
+    """
+    Isi Pulau / Provinsi dari baris header grup (satu sel terisi):
+    nama pulau membuka grup Pulau, header lain membuka grup Provinsi.
+    Lihat data/hierarchy.py.
+    """
+    return recover_hierarchy(df, PULAU_NAMES, levels=("Pulau", "Provinsi"))
+
+
+# =====================================================
+# NORMALISASI DIMS (dulu di pages/direct_tasti.py)
+# =====================================================
+def normalize_dims(df):
+    """
+    Route huruf besar, Pulau / Provinsi di-strip & fill-down (in-place).
+    """
+    if "Route" in df.columns:
+        df["Route"] = to_upper(df["Route"])
+
+    for col in ("Pulau", "Provinsi"):
+        if col in df.columns:
+            df[col] = ffill_text(df[col])
+    return df
+
+
+def canonicalize_columns(df):
+    """
+    Samakan nama kolom dims tabel value ("PULAU", "Kab/Kota", ...)
+    dengan tabel persentase, lalu normalisasi ulang.
+    """
     if df is None or df.empty:
         return df
 
-    cur_pulau = None
-    cur_prov = None
+    lower_map = {str(c).lower(): c for c in df.columns}
+    col_map = {}
 
-    for i in range(len(df)):
-        row = df.iloc[i]
+    # pemetaan yang sama dipakai untuk mencari header tabel (config.SHEET_SCHEMAS)
+    for orig in lower_map.values():
+        name = dim_label(orig)
+        if name is not None:
+            col_map[orig] = name
 
-        filled_cells = [
-            c for c in df.columns
-            if isinstance(row[c], str) and row[c].strip() != ""
-        ]
+    if col_map:
+        df = df.rename(columns=col_map)
 
-        # Baris header grup (biasanya hanya 1 sel terisi)
-        if len(filled_cells) == 1:
-            val = row[filled_cells[0]].strip().upper()
+    return normalize_dims(df)
 
-            if val in ("SUMATERA", "JAWA", "KALIMANTAN", "SULAWESI", "BALI NT"):
-                cur_pulau = val
-                cur_prov = None
-                continue
-            else:
-                cur_prov = val
-                continue
 
-        # Baris data
-        if cur_pulau:
-            df.at[i, "Pulau"] = cur_pulau
-        if cur_prov:
-            df.at[i, "Provinsi"] = cur_prov
+# =====================================================
+# KOLOM BULAN
+# =====================================================
+def month_columns(df):
+    """
+    return : kolom bulan (selain dims & Type), urutan kolom sheet
+    """
+    if df is None:
+        return []
+    return [c for c in df.columns if c not in REVKAB_DIMS + ("Type",)]
 
-    return df
+
+def select_month_columns(columns, months, selected):
+    """
+    Buang kolom bulan di luar `selected`; kolom lain (dims, Type, kolom
+    yang bukan bulan) tetap, urutan asli dipertahankan.
+    """
+    months, selected = set(months), set(selected)
+    return [c for c in columns if c not in months or c in selected]
 
 
 # =====================================================
 # MAIN LOADER
 # =====================================================
 def load_clean_revbykab(load_excel, sheet_name="RevbyKab"):
-    raw = load_excel(sheet_name=sheet_name, header=None)
+    """
+    Satu parse header=None, dua tabel dipotong berdasarkan baris header
+    (lihat config.SHEET_SCHEMAS).
+
+    return : (df_pct, df_val)
+             df_pct : tabel persentase, dims sudah bersih & fill-down
+             df_val : tabel value, dims sudah dikanonisasi & fill-down
+    """
+    tables = read_schema(load_excel, sheet_name, SHEET_SCHEMAS[SHEET_NAME_REVKAB])
+    df_pct = tables["pct"]
+
+    # 🔑 EXACTLY like app.py original (sel kosong sudah NaN dari skema,
+    # Route sudah huruf besar)
+    for col in ("Pulau", "Provinsi", "Kab Kota"):
+        df_pct[col] = df_pct[col].ffill()
 
-    # --- percentage table ---
-    raw_pct = raw.iloc[:358].copy()
-    header = raw_pct.iloc[3].fillna("").astype(str).tolist()
+    df_val = tables["value"]
+    if df_val is not None and not df_val.empty:
+        # nama dims dikanonisasi dulu, baru normalize_dims (di dalamnya)
+        df_val = canonicalize_columns(df_val)
 
-    df_pct = raw_pct.iloc[4:].copy().reset_index(drop=True)
-    df_pct.columns = header
+    return df_pct, df_val
 
-    # normalize column names
-    df_pct.columns = [str(c).strip() for c in df_pct.columns]
 
-    # ensure columns exist
-    for c in ("Pulau", "Provinsi", "Kab Kota", "Route"):
-        if c not in df_pct.columns:
-            df_pct[c] = np.nan
+def load_revbykab_dataset(version):
+    """
+    Dataset RevbyKab yang sudah bersih, sekali per versi workbook untuk
+    semua sesi (config.shared_dataset). Page cukup filter & render.
 
-    # 🔑 EXACTLY like app.py original
-    for col in ("Pulau", "Provinsi", "Kab Kota"):
-        df_pct[col] = (
-            df_pct[col]
-            .apply(lambda x: x.strip() if isinstance(x, str) and x.strip() != "" else np.nan)
-            .ffill()
-        )
-
-    # normalize Route
-    df_pct["Route"] = df_pct["Route"].apply(
-        lambda v: v.strip().upper() if isinstance(v, str) and v.strip() != "" else np.nan
-    )
+    version : config.workbook_version()
+    return  : (df_pct, df_val) seperti load_clean_revbykab
+              (salinan dangkal per pemanggil, jadi aman diubah)
+    """
+    return shared_dataset(("revbykab", version), _build_revbykab_dataset)
 
-    # parse percentage values
-    def parse_pct(v):
-        if pd.isna(v):
-            return np.nan
-        if isinstance(v, (int, float)):
-            return v / 100 if v > 1.5 else v
-        s = str(v).replace("%", "").replace(",", "")
-        try:
-            x = float(s)
-            return x / 100 if x > 1.5 else x
-        except:
-            return np.nan
 
-    for c in df_pct.columns:
-        if c not in ("Pulau", "Provinsi", "Kab Kota", "Route", "Type"):
-            df_pct[c] = df_pct[c].apply(parse_pct)
+def _build_revbykab_dataset():
+    with st.spinner("Loading RevbyKab..."):
+        df_pct, df_val = load_clean_revbykab(load_excel, sheet_name=SHEET_NAME_REVKAB)
 
-    return df_pct, None
+    # dims -> category / intern (lihat data/compact.py); dims tabel value
+    # cukup di-intern karena page memformatnya sebagai teks
+    df_pct = compact_dataset("RevbyKab %", df_pct, dims=REVKAB_DIMS)
+    if df_val is not None:
+        df_val = compact_dataset("RevbyKab value", df_val, ids=REVKAB_DIMS)
+    return df_pct, df_val
 
 
+# =====================================================
+# CUBE PANGSA (GRAPH MODE)
+# =====================================================
+def load_revbykab_cube(version):
+    """
+    ShareCube tabel persentase: REVKAB_DIMS x bulan (data/cube.py),
+    sekali per versi workbook. None kalau tabel persentase kosong.
+    """
+    return shared_dataset(("revbykab_cube", version), lambda: _build_revbykab_cube(version))
+
+
+def _build_revbykab_cube(version):
+    df_pct, _ = load_revbykab_dataset(version)
+    if df_pct is None or df_pct.empty:
+        return None
+
+    return build_share_cube(df_pct, REVKAB_DIMS, month_columns(df_pct))
+
+
+# =====================================================
+# INDEX FILTER SIDEBAR
+# =====================================================
+FILTER_DIMS = ("Pulau", "Provinsi", "Route")
+
+
+def load_revbykab_filters(version):
+    """
+    FilterIndex (data/filterindex.py) untuk tabel persentase & value,
+    sekali per versi workbook.
+
+    return : (idx_pct, idx_val), None untuk tabel yang kosong
+    """
+    return shared_dataset(("revbykab_filters", version), lambda: _build_revbykab_filters(version))
+
+
+def _build_revbykab_filters(version):
+    return tuple(
+        None if df is None or df.empty else FilterIndex(df, FILTER_DIMS)
+        for df in load_revbykab_dataset(version)
+    )
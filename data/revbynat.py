@@ -1,64 +1,182 @@
 # data/revbynat.py
+"""
+RevbyNat: pangsa DIRECT / TASTI per kuartal -> frame kuartalan dengan
+PeriodIndex, lalu agregasi tahunan & semester secara vektor (berapa pun
+jumlah tahunnya). Frame siap-pakai untuk page Summary dibangun sekali
+per versi workbook (load_revbynat_summary).
+"""
+import re
+
 import numpy as np
-from config import SHEET_NAME_REVNAT
+import pandas as pd
 
+from config import SHEET_NAME_REVNAT, load_excel, shared_dataset
 
-def load_revby_nat(load_excel):
+TYPES = ["DIRECT", "TASTI"]
+
+# "23-Q1" / "2023-Q1"
+_QUARTER_RE = re.compile(r"^\s*(\d{2}|\d{4})-Q([1-4])\s*$")
+
+
+# =====================================================
+# KUARTAL (PERIODINDEX)
+# =====================================================
+def parse_quarter(label):
     """
-    load_excel : function(sheet_name=...) -> DataFrame
+    return : pd.Period kuartal, None kalau label bukan "YY-Qn" / "YYYY-Qn"
     """
+    m = _QUARTER_RE.match(label) if isinstance(label, str) else None
+    if m is None:
+        return None
+    year = int(m.group(1))
+    if year < 100:
+        year += 2000
+    return pd.Period(year=year, quarter=int(m.group(2)), freq="Q")
 
-    df = load_excel(sheet_name=SHEET_NAME_REVNAT)
 
-    # ===============================
-    # Header row (Row Labels)
-    # ===============================
+def quarterly_shares(df):
+    """
+    df     : sheet RevbyNat mentah (kolom "Type", baris "Row Labels"
+             berisi label kuartal, baris DIRECT & TASTI berisi pangsa)
+    return : DataFrame float, index PeriodIndex kuartal (urut),
+             kolom DIRECT / TASTI
+    """
     header_row = df[df["Type"] == "Row Labels"].iloc[0]
 
-    quarter_labels, quarter_cols = [], []
+    periods, cols = [], []
     for col in df.columns:
-        val = header_row[col]
-        if isinstance(val, str) and "-Q" in val:
-            quarter_labels.append(val)
-            quarter_cols.append(col)
-
-    # ===============================
-    # Data rows
-    # ===============================
-    direct_row = df[df["Type"] == "DIRECT"].iloc[0]
-    tasti_row  = df[df["Type"] == "TASTI"].iloc[0]
-
-    quarter_data = {
-        q: {
-            "DIRECT": float(direct_row[c]),
-            "TASTI": float(tasti_row[c])
-        }
-        for q, c in zip(quarter_labels, quarter_cols)
-    }
+        period = parse_quarter(header_row[col])
+        if period is not None:
+            periods.append(period)
+            cols.append(col)
+
+    # baris pertama per Type, seperti sebelumnya
+    rows = df[df["Type"].isin(TYPES)].drop_duplicates("Type").set_index("Type")
+    out = rows.loc[TYPES, cols].T.astype(float)
+    out.columns = pd.Index(TYPES)
+    out.index = pd.PeriodIndex(periods, freq="Q", name="Quarter")
+    return out.sort_index()
+
+
+def _group_mean(quarterly, keys):
+    """
+    keys   : kunci groupby per baris (quarterly sudah urut, jadi sort=False
+             tetap urut kunci)
+    return : rata-rata per grup; seperti np.mean, satu NaN di grup -> NaN
+    """
+    shares = quarterly[TYPES]
+    has_nan = shares.isna().groupby(keys, sort=False).any()
+    return shares.groupby(keys, sort=False).mean().mask(has_nan)
+
+
+def yearly_shares(quarterly):
+    """
+    return : rata-rata pangsa per tahun, index tahun (int)
+    """
+    return _group_mean(quarterly, quarterly.index.year.rename("Year"))
+
+
+def semester_shares(quarterly):
+    """
+    return : rata-rata pangsa per semester, MultiIndex (tahun, semester 1/2)
+    """
+    idx = quarterly.index
+    keys = [
+        idx.year.rename("Year"),
+        pd.Index(np.where(idx.quarter <= 2, 1, 2), name="Semester"),
+    ]
+    return _group_mean(quarterly, keys)
 
-    # ===============================
-    # Aggregate Year & Semester
-    # ===============================
-    year_map = {"23": "2023", "24": "2024", "25": "2025"}
 
-    yearly, semester = {}, {}
+def load_revby_nat(load_excel):
+    """
+    load_excel : function(sheet_name=...) -> DataFrame
+    return     : (yearly, semester, quarterly) -- lihat fungsi di atas
+    """
+    quarterly = quarterly_shares(load_excel(sheet_name=SHEET_NAME_REVNAT))
+    return yearly_shares(quarterly), semester_shares(quarterly), quarterly
 
-    for q, v in quarter_data.items():
-        y, qn = q.split("-Q")
-        year = year_map.get(y, "20" + y)
-        qn = int(qn)
 
-        yearly.setdefault(year, {"DIRECT": [], "TASTI": []})
-        yearly[year]["DIRECT"].append(v["DIRECT"])
-        yearly[year]["TASTI"].append(v["TASTI"])
+# =====================================================
+# FRAME UNTUK PAGE SUMMARY
+# =====================================================
+def _pct_text(x):
+    return f"{x*100:.1f}%"
 
-        sem = "S1" if qn <= 2 else "S2"
-        k = f"{year}-{sem}"
-        semester.setdefault(k, {"DIRECT": [], "TASTI": []})
-        semester[k]["DIRECT"].append(v["DIRECT"])
-        semester[k]["TASTI"].append(v["TASTI"])
 
-    yearly = {k: {t: np.mean(v[t]) for t in v} for k, v in yearly.items()}
-    semester = {k: {t: np.mean(v[t]) for t in v} for k, v in semester.items()}
+def _chart_long(shares, labels, key):
+    """
+    Format panjang untuk stacked bar: per periode TASTI lalu DIRECT,
+    LabelPos = posisi teks di tengah segmen.
+    """
+    long = pd.DataFrame({
+        key: np.repeat(labels, 2),
+        "Type": ["TASTI", "DIRECT"] * len(labels),
+        "Share": shares[["TASTI", "DIRECT"]].to_numpy().ravel(),
+    })
+    long[key] = pd.Categorical(long[key], categories=labels, ordered=True)
+    long["LabelPos"] = np.where(
+        long["Type"] == "DIRECT",
+        long["Share"] / 2,
+        1 - long["Share"] / 2
+    )
+    return long
+
+
+def _pivot_table(shares, labels):
+    # baris DIRECT / TASTI, satu kolom teks persen per periode
+    table = shares[TYPES].T.map(_pct_text).reset_index(drop=True)
+    table.columns = labels
+    table.insert(0, "Type", TYPES)
+    return table
 
-    return yearly, semester, quarter_data
+
+def summary_frames(quarterly):
+    """
+    return : dict frame siap render untuk page Summary
+             year_labels, yearly (index label tahun), yearly_long,
+             semester_labels, semester_long, semester_table,
+             quarter_labels, quarter_long, quarter_table
+    """
+    yearly = yearly_shares(quarterly)
+    year_labels = [str(y) for y in yearly.index]
+    yearly.index = pd.Index(year_labels, name="Year")
+
+    yearly_long = yearly.reset_index().melt(
+        id_vars="Year",
+        value_vars=TYPES,
+        var_name="Type",
+        value_name="Share",
+    )
+    yearly_long["LabelPos"] = np.where(
+        yearly_long["Type"] == "DIRECT",
+        yearly_long["Share"] / 2,
+        1 - yearly_long["Share"] / 2
+    )
+
+    semester = semester_shares(quarterly)
+    semester_labels = [f"S{s} {y}" for y, s in semester.index]
+
+    quarter_labels = [f"Q{p.quarter} {p.year}" for p in quarterly.index]
+
+    return {
+        "year_labels": year_labels,
+        "yearly": yearly,
+        "yearly_long": yearly_long,
+        "semester_labels": semester_labels,
+        "semester_long": _chart_long(semester, semester_labels, "Semester"),
+        "semester_table": _pivot_table(semester, semester_labels),
+        "quarter_labels": quarter_labels,
+        "quarter_long": _chart_long(quarterly, quarter_labels, "Quarter"),
+        "quarter_table": _pivot_table(quarterly, quarter_labels),
+    }
+
+
+def load_revbynat_summary(version):
+    """
+    Frame Summary RevbyNat, dibangun sekali per versi workbook untuk semua sesi.
+    """
+    return shared_dataset(
+        ("revbynat_summary", version),
+        lambda: summary_frames(quarterly_shares(load_excel(sheet_name=SHEET_NAME_REVNAT)))
+    )
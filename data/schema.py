@@ -0,0 +1,191 @@
+# data/schema.py
+"""
+Baca sheet sesuai skema deklaratif (config.SHEET_SCHEMAS): baris header
+(+ label anchor), rentang baris, kolom yang dipakai, dan dtype per kolom.
+
+Sheet dibaca sekali, utuh (header=None), lalu tabel dipotong di memori.
+Tidak ada proyeksi baris / kolom saat baca: posisi header baru diketahui
+dari isi sel, dan baca kedua yang terproyeksi (setelah anchor ketemu)
+lebih mahal dari yang dihemat -- tabel RevbyKab & Top10Part memakai
+hampir semua baris dan kolom sheet.
+
+Skema (dict):
+    anchor : label (atau tuple label) yang menandai baris header; header
+             dicari dari isi sel, bukan nomor baris. Anchor tidak ketemu
+             -> ValueError (tidak jatuh diam-diam ke nomor baris)
+    labels : function(isi sel) -> label untuk dicocokkan dengan anchor;
+             default tidak peka huruf besar / spasi
+    header : index baris header di grid mentah (0-based), untuk skema
+             tanpa anchor
+    stop   : index baris akhir (eksklusif) untuk skema tanpa anchor,
+             None = sampai habis
+    end    : "trim" -> buang baris kosong di ujung tabel (baris kosong
+             di tengah tabel tetap ikut)
+    tables : {nama: skema tabel} untuk beberapa tabel di satu sheet
+             (anchor ke-i = tabel ke-i, berakhir di anchor berikutnya),
+             dibaca dari satu grid
+    names  : "raw"    -> label = isi sel header apa adanya (str, kosong = "")
+             "pandas" -> label seperti pd.read_excel (Unnamed: i, duplikat .1 / .2)
+    until  : buang semua kolom setelah kolom berlabel ini
+    drop_unnamed : buang kolom "Unnamed: ..." (hanya untuk names="pandas")
+    require : kolom yang dijamin ada (diisi NaN kalau tidak ada)
+    dtypes : {label: dtype}; "Prefix*" = semua label berawalan Prefix,
+             "*" = kolom lain; dtype None = biarkan apa adanya
+"""
+import numpy as np
+
+from data.cleaning import to_number, to_pct, to_text, to_upper
+from data.workbook import rows_to_frame
+
+
+# =====================================================
+# DTYPE (lihat data/cleaning.py)
+# =====================================================
+DTYPES = {
+    "text": to_text,
+    "upper": to_upper,
+    "pct": to_pct,
+    "number": to_number,
+}
+
+
+def dtype_for(label, dtypes):
+    if label in dtypes:
+        return dtypes[label]
+    for key, dtype in dtypes.items():
+        if key != "*" and key.endswith("*") and label.startswith(key[:-1]):
+            return dtype
+    return dtypes.get("*")
+
+
+# =====================================================
+# HEADER & BATAS TABEL
+# =====================================================
+def cell_label(v):
+    """
+    Label default untuk anchor: spasi dirapikan, tidak peka huruf besar.
+    """
+    return " ".join(str(v).split()).casefold()
+
+
+def _is_header(row, anchor, labels):
+    wanted = (anchor,) if isinstance(anchor, str) else tuple(anchor)
+    cells = {labels(v) for v in row if isinstance(v, str)}
+    return all(labels(label) in cells for label in wanted)
+
+
+def header_rows(raw, anchor, labels=None):
+    """
+    labels : function(isi sel) -> label, default cell_label
+    return : list index baris yang memuat semua label `anchor`
+    """
+    labels = labels or cell_label
+    return [
+        i for i, row in enumerate(raw.itertuples(index=False))
+        if _is_header(row, anchor, labels)
+    ]
+
+
+def _table_stop(raw, header, stop, end):
+    stop = len(raw) if stop is None else min(stop, len(raw))
+    if end == "trim":
+        filled = raw.iloc[header + 1:stop].notna().any(axis=1).to_numpy()
+        last = len(filled) - int(filled[::-1].argmax()) if filled.any() else 0
+        stop = header + 1 + last
+    return stop
+
+
+def locate_tables(raw, anchor, tables, labels=None):
+    """
+    raw    : DataFrame header=None
+    anchor : label (atau tuple label) yang menandai baris header,
+             None = pakai header / stop yang dideklarasikan per tabel
+    tables : list skema tabel, urut dari atas ke bawah
+    return : list (header, stop) per tabel
+
+    Tabel ke-i = header anchor ke-i, berakhir di header berikutnya (baris
+    kosong di ujungnya dibuang kalau end="trim"). Anchor yang kurang dari
+    jumlah tabel -> ValueError.
+    """
+    if anchor is None:
+        return [
+            (t.get("header", 0), _table_stop(raw, t.get("header", 0), t.get("stop"), t.get("end")))
+            for t in tables
+        ]
+
+    found = header_rows(raw, anchor, labels)
+    if len(found) < len(tables):
+        raise ValueError(
+            f"header tabel tidak ketemu: anchor {anchor!r} ada di "
+            f"{len(found)} baris, skema butuh {len(tables)}"
+        )
+
+    out = []
+    for i, table in enumerate(tables):
+        header = found[i]
+        stop = found[i + 1] if i + 1 < len(found) else None
+        out.append((header, _table_stop(raw, header, stop, table.get("end"))))
+    return out
+
+
+# =====================================================
+# READ
+# =====================================================
+def frame_from_grid(raw, header, stop, schema):
+    """
+    Potong satu tabel dari grid mentah, beri label & dtype sesuai skema.
+    """
+    block = raw.iloc[header:stop]
+
+    if schema.get("names", "raw") == "pandas":
+        df = rows_to_frame(block.values.tolist(), header=0)
+        if schema.get("drop_unnamed"):
+            df = df.loc[:, ~df.columns.astype(str).str.startswith("Unnamed")]
+    else:
+        labels = block.iloc[0].fillna("").astype(str).tolist()
+        df = block.iloc[1:].copy().reset_index(drop=True)
+        df.columns = labels
+
+    df.columns = [str(c).strip() for c in df.columns]
+
+    until = schema.get("until")
+    if until is not None and until in df.columns:
+        df = df.iloc[:, : list(df.columns).index(until) + 1]
+
+    for c in schema.get("require", ()):
+        if c not in df.columns:
+            df[c] = np.nan
+
+    dtypes = schema.get("dtypes", {})
+    for c in df.columns:
+        dtype = dtype_for(c, dtypes)
+        if dtype is not None:
+            df[c] = DTYPES[dtype](df[c])
+
+    return df
+
+
+def read_schema(load_excel, sheet_name, schema):
+    """
+    load_excel : function(sheet_name=..., **kwargs) -> DataFrame
+    return     : DataFrame yang sudah dipotong (baris & kolom) dan bertipe;
+                 kalau skema punya "tables": dict {nama tabel: DataFrame},
+                 semua dari satu grid header=None
+    """
+    tables = schema.get("tables")
+    if tables is None:
+        tables = {None: schema}
+
+    raw = load_excel(sheet_name=sheet_name, header=None)
+
+    try:
+        regions = locate_tables(
+            raw, schema.get("anchor"), list(tables.values()), schema.get("labels")
+        )
+    except ValueError as e:
+        raise ValueError(f"sheet {sheet_name}: {e}") from None
+    frames = {
+        name: frame_from_grid(raw, header, stop, table)
+        for (name, table), (header, stop) in zip(tables.items(), regions)
+    }
+    return frames if "tables" in schema else frames[None]
@@ -0,0 +1,71 @@
+# data/sheetgrid.py
+# Sengaja tanpa pandas: modul ini juga di-import proses worker parse paralel.
+import numpy as np
+from openpyxl import load_workbook
+
+from data.colcache import rows_to_table, table_to_ipc
+
+
+# =====================================================
+# RAW CELL GRID (SAMA PERSIS DENGAN pd.read_excel)
+# =====================================================
+def _convert_cell(cell):
+    # mengikuti pandas OpenpyxlReader._convert_cell
+    if cell.value is None:
+        return ""
+    if cell.data_type == "e":
+        return np.nan
+    if cell.data_type == "n":
+        val = int(cell.value)
+        if val == cell.value:
+            return val
+        return float(cell.value)
+    return cell.value
+
+
+def sheet_rows(ws):
+    """
+    ws     : openpyxl worksheet (read_only)
+    return : list[list] — grid mentah, baris & kolom kosong di ujung dibuang
+    """
+    ws.reset_dimensions()
+
+    data = []
+    last_row_with_data = -1
+    for row_number, row in enumerate(ws.rows):
+        converted = [_convert_cell(cell) for cell in row]
+        while converted and converted[-1] == "":
+            converted.pop()
+        if converted:
+            last_row_with_data = row_number
+        data.append(converted)
+
+    data = data[: last_row_with_data + 1]
+
+    if data:
+        width = max(len(r) for r in data)
+        data = [r + [""] * (width - len(r)) for r in data]
+
+    return data
+
+
+def read_workbook_rows(path, sheets=None):
+    """
+    Satu kali buka workbook, baca grid mentah semua sheet (atau `sheets`).
+    return : dict {sheet_name: rows}
+    """
+    wb = load_workbook(path, read_only=True, data_only=True, keep_links=False)
+    try:
+        names = wb.sheetnames if sheets is None else sheets
+        return {name: sheet_rows(wb[name]) for name in names}
+    finally:
+        wb.close()
+
+
+def parse_sheet_ipc(path, sheet_name):
+    """
+    Jalan di proses worker: parse satu sheet, kirim balik sebagai
+    bytes Arrow IPC (lebih ringkas dari pickle list of lists).
+    """
+    rows = read_workbook_rows(path, sheets=[sheet_name])[sheet_name]
+    return table_to_ipc(rows_to_table(rows))
@@ -0,0 +1,54 @@
+# data/singleflight.py
+import threading
+from concurrent.futures import Future
+
+
+class SingleFlight:
+    """
+    Pemanggil pertama untuk sebuah key menjalankan fungsi; pemanggil lain
+    yang datang selama masih berjalan menunggu Future yang sama
+    (hasil atau exception yang sama), tanpa menjalankan ulang.
+
+    Semua pemanggil dapat objek hasil yang sama; kalau perlu salinan per
+    pemanggil, salin di atasnya (lihat data/registry.share).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.executed = 0      # berapa kali fungsi benar-benar dijalankan
+        self.suppressed = 0    # berapa pemanggil duplikat yang ikut menunggu
+
+    def do(self, key, fn):
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+                self.executed += 1
+            else:
+                self.suppressed += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "executed": self.executed,
+                "suppressed": self.suppressed,
+                "in_flight": len(self._calls),
+            }
@@ -0,0 +1,717 @@
+# data/workbook.py
+import multiprocessing
+import os
+import shutil
+import threading
+import time
+import uuid
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+from openpyxl.cell.cell import ERROR_CODES
+from pandas._libs.parsers import STR_NA_VALUES
+from pandas.io.parsers import TextParser
+
+from data.colcache import (
+    KIND_FLOAT,
+    KIND_INT,
+    KIND_STR,
+    file_sha256,
+    ipc_to_table,
+    rows_to_table,
+    table_shape,
+    table_to_grid,
+    table_to_rows,
+)
+from data.sheetgrid import parse_sheet_ipc, read_workbook_rows
+from data.singleflight import SingleFlight
+from data.xlsxparts import sheet_digests, sheet_parts
+
+
+# =====================================================
+# FILE VERSION
+# =====================================================
+def file_version(path):
+    """
+    Versi file = mtime + size. Berubah setiap kali file ditulis ulang.
+    """
+    stat = Path(path).stat()
+    return f"{stat.st_mtime_ns}-{stat.st_size}"
+
+
+def pin_file(path, directory):
+    """
+    Bekukan isi file saat ini: hard link (atau salinan kalau link gagal,
+    mis. beda drive) ke directory/<nama unik>. Download berikutnya menimpa
+    `path` lewat os.replace (inode baru), jadi isi file pin -- dan
+    file_version-nya -- tidak pernah berubah selama snapshot dilayani.
+
+    return : path file pin
+    """
+    path, directory = Path(path), Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    pinned = directory / f"{uuid.uuid4().hex}{path.suffix}"
+    try:
+        os.link(path, pinned)
+    except OSError:
+        shutil.copy2(path, pinned)
+    return pinned
+
+
+# =====================================================
+# PARSE PARALEL (PROCESS POOL)
+# =====================================================
+def _sheet_sizes(path):
+    try:
+        with zipfile.ZipFile(path) as zf:
+            return {name: zf.getinfo(part).file_size for name, part in sheet_parts(zf)}
+    except (KeyError, OSError, zipfile.BadZipFile):
+        return {}
+
+
+def parse_sheets(path, sheets=None, workers=1, min_parallel_bytes=2 * 1024 * 1024):
+    """
+    Seperti read_workbook_rows, tapi sheet-sheet di-parse paralel
+    di `workers` proses kalau workers > 1.
+
+    min_parallel_bytes : total XML sheet (belum dikompres) minimal supaya
+                         pakai process pool; di bawah itu biaya start proses
+                         lebih besar dari hasilnya
+
+    return : dict {sheet_name: pa.Table sel (data.colcache.rows_to_table)}
+             (urutan sesuai `sheets`)
+    """
+    if sheets is None:
+        sheets = list_sheet_names(path)
+
+    size = _sheet_sizes(path) if workers > 1 and len(sheets) > 1 else {}
+    total = sum(size.get(name, 0) for name in sheets)
+
+    if workers <= 1 or len(sheets) <= 1 or total < min_parallel_bytes:
+        return {
+            name: rows_to_table(rows)
+            for name, rows in read_workbook_rows(path, sheets=sheets).items()
+        }
+
+    # spawn, bukan fork: proses streamlit punya banyak thread
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=min(workers, len(sheets)), mp_context=ctx) as pool:
+        futures = {
+            name: pool.submit(parse_sheet_ipc, str(path), name)
+            for name in sorted(sheets, key=lambda n: size.get(n, 0), reverse=True)
+        }
+        return {
+            name: ipc_to_table(futures[name].result())
+            for name in sheets
+        }
+
+
+def rows_to_frame(rows, header=0, **kwargs):
+    """
+    Terapkan header / skiprows / nrows / usecols di memori,
+    dengan parser yang sama yang dipakai pd.read_excel.
+    """
+    if not rows:
+        return pd.DataFrame()
+
+    nrows = kwargs.get("nrows")
+    parser = TextParser(
+        rows,
+        header=header,
+        skip_blank_lines=False,
+        **kwargs
+    )
+    return parser.read(nrows=nrows)
+
+
+# teks yang bisa diubah TextParser jadi NaN / angka / bool
+_BOOL_STRINGS = {"True", "TRUE", "true", "False", "FALSE", "false"}
+
+
+def _plain_string(s):
+    if s in STR_NA_VALUES or s in _BOOL_STRINGS:
+        return False
+    try:
+        float(s)
+    except ValueError:
+        return True
+    return False
+
+
+def grid_frame(table, nrows=None, usecols=None):
+    """
+    Sama dengan rows_to_frame(table_to_rows(table), header=None, nrows=..., usecols=...),
+    tapi kolom DataFrame dibangun langsung dari lane Arrow tabel sel, tanpa
+    grid list[list] perantara.
+
+    Kolom yang isinya cuma int / float / teks biasa disusun di sini dengan
+    hasil inferensi yang sama (int64, float64 + NaN, atau object). Kolom lain
+    (bool, tanggal, jam, atau semua teksnya mirip angka / NA / bool) tetap
+    lewat TextParser, per kolom.
+
+    table   : pa.Table dari data.colcache.rows_to_table
+    usecols : list posisi kolom (int) atau None
+    return  : DataFrame, atau None kalau argumennya di luar yang didukung
+              (pemanggil pakai rows_to_frame)
+    """
+    n_rows, n_cols = table_shape(table)
+
+    if usecols is None:
+        cols = list(range(n_cols))
+    elif isinstance(usecols, (list, tuple, range)) and all(
+        isinstance(c, (int, np.integer)) and not isinstance(c, bool) and 0 <= c < n_cols
+        for c in usecols
+    ):
+        cols = sorted(set(int(c) for c in usecols))
+    else:
+        return None
+
+    if nrows is not None:
+        if not isinstance(nrows, (int, np.integer)) or nrows < 1:
+            return None
+        n_rows = min(n_rows, int(nrows))
+
+    if n_rows == 0:
+        return pd.DataFrame()
+
+    row = table.column("row").to_numpy()
+    col = table.column("col").to_numpy()
+    kind = table.column("kind").to_numpy()
+    ints = table.column("int").fill_null(0).to_numpy()
+    nums = table.column("num").fill_null(np.nan).to_numpy()
+
+    # sel per kolom, tetap urut baris (tabel sel disimpan baris-mayor);
+    # sort stabil int16 = radix sort
+    keep = row < n_rows
+    if len(cols) < n_cols:
+        keep &= np.isin(col, cols)
+    keep = np.flatnonzero(keep)
+    by_col = col[keep].astype(np.int16) if n_cols < 2 ** 15 else col[keep]
+    keep = keep[np.argsort(by_col, kind="stable")]
+    bounds = np.searchsorted(col[keep], cols + [n_cols])
+
+    text = None
+    grid = None
+    data = {}
+    for n, j in enumerate(cols):
+        idx = keep[bounds[n]:bounds[n + 1]]
+        k, r = kind[idx], row[idx]
+        is_int, is_float, is_str = k == KIND_INT, k == KIND_FLOAT, k == KIND_STR
+
+        strs = ()
+        if is_str.any():
+            if text is None:
+                text = table.column("text").to_numpy(zero_copy_only=False)
+            strs = text[idx[is_str]]
+
+        if not (is_int | is_float | is_str).all() or (
+            len(strs) and not any(_plain_string(s) for s in strs)
+        ):
+            if grid is None:
+                grid = table_to_grid(table)
+            data[j] = rows_to_frame(grid[:n_rows, [j]].tolist(), header=None)[0]
+            continue
+
+        if len(strs):
+            values = np.full(n_rows, np.nan, dtype=object)
+            values[r[is_int]] = ints[idx[is_int]]
+            values[r[is_float]] = nums[idx[is_float]]
+            values[r[is_str]] = strs
+            na = [s in STR_NA_VALUES for s in strs]
+            if any(na):
+                values[r[is_str][na]] = np.nan
+        elif is_int.all() and len(idx) == n_rows:
+            values = ints[idx]
+        else:
+            values = np.full(n_rows, np.nan)
+            values[r[is_int]] = ints[idx[is_int]]
+            values[r[is_float]] = nums[idx[is_float]]
+        data[j] = values
+
+    return pd.DataFrame(data, columns=pd.Index(cols))
+
+
+# =====================================================
+# STREAMING READER (MEMORI TERBATAS)
+# =====================================================
+def _convert_value(v):
+    # padanan _convert_cell untuk iter_rows(values_only=True)
+    if v is None:
+        return ""
+    if isinstance(v, float):
+        return int(v) if v.is_integer() else v
+    if isinstance(v, str) and v in ERROR_CODES:
+        return np.nan
+    return v
+
+
+def _convert_values(values):
+    row = [_convert_value(v) for v in values]
+    while row and row[-1] == "":
+        row.pop()
+    return row
+
+
+def _chunk_frame(head, chunk):
+    width = max([len(head or [])] + [len(r) for r in chunk])
+    data = [r + [""] * (width - len(r)) for r in chunk]
+    if head is None:
+        return rows_to_frame(data, header=None)
+    return rows_to_frame([head + [""] * (width - len(head))] + data, header=0)
+
+
+def list_sheet_names(path):
+    wb = load_workbook(path, read_only=True, keep_links=False)
+    try:
+        return list(wb.sheetnames)
+    finally:
+        wb.close()
+
+
+def iter_sheet_chunks(path, sheet_name, chunk_rows=2000, max_rows=None,
+                      header=0, skiprows=0, stats=None):
+    """
+    Baca satu sheet baris per baris (openpyxl read-only, values_only)
+    dan yield DataFrame per `chunk_rows` baris. Paling banyak satu chunk
+    yang dipegang di memori, tidak ada DOM workbook utuh.
+
+    max_rows : batas baris data per sheet (None = semua)
+    stats    : dict opsional, diisi "total_rows" (dihitung sampai akhir sheet
+               tanpa menyimpan baris setelah batas)
+    """
+    wb = load_workbook(path, read_only=True, data_only=True, keep_links=False)
+    try:
+        rows = wb[sheet_name].iter_rows(values_only=True)
+
+        for _ in range(skiprows or 0):
+            next(rows, None)
+
+        head = None
+        if header is not None:
+            for _ in range(header):
+                next(rows, None)
+            values = next(rows, None)
+            if values is None:
+                return
+            head = _convert_values(values)
+
+        chunk = []
+        pending_blank = 0   # baris kosong di tengah, dibuang kalau ternyata di ekor
+        n_rows = 0
+        capped = False
+
+        for values in rows:
+            row = _convert_values(values)
+            if not row:
+                pending_blank += 1
+                continue
+
+            for blank in [[]] * pending_blank + [row]:
+                n_rows += 1
+                if max_rows is not None and n_rows > max_rows:
+                    capped = True
+                    continue
+                chunk.append(blank)
+            pending_blank = 0
+
+            if len(chunk) >= chunk_rows:
+                yield _chunk_frame(head, chunk)
+                chunk = []
+
+            if capped and stats is None:
+                break
+
+        if chunk:
+            yield _chunk_frame(head, chunk)
+
+        if stats is not None:
+            stats["total_rows"] = n_rows
+    finally:
+        wb.close()
+
+
+def read_sheet_head(path, sheet_name, max_rows, chunk_rows=2000, **kwargs):
+    """
+    return : (DataFrame maksimal max_rows baris, total baris data di sheet)
+    """
+    stats = {}
+    chunks = list(iter_sheet_chunks(
+        path, sheet_name,
+        chunk_rows=chunk_rows,
+        max_rows=max_rows,
+        stats=stats,
+        **kwargs
+    ))
+    if not chunks:
+        return pd.DataFrame(), stats.get("total_rows", 0)
+
+    df = pd.concat(chunks, ignore_index=True) if len(chunks) > 1 else chunks[0]
+    return df, stats.get("total_rows", len(df))
+
+
+# =====================================================
+# SNAPSHOT
+# =====================================================
+class SheetRowCache:
+    """
+    Tabel sel (pa.Table) per digest sheet di memori, dibagi antar snapshot.
+    Versi file baru memakai ulang tabel sheet yang digest-nya sama.
+    """
+
+    def __init__(self):
+        self._tables = {}
+        self._lock = threading.Lock()
+
+    def get(self, digest):
+        with self._lock:
+            return self._tables.get(digest)
+
+    def put(self, digest, table):
+        with self._lock:
+            self._tables[digest] = table
+
+    def retain(self, digests):
+        # buang tabel sheet yang tidak dipakai snapshot terbaru
+        with self._lock:
+            self._tables = {d: t for d, t in self._tables.items() if d in digests}
+
+
+class WorkbookSnapshot:
+    """
+    Grid mentah sheet-sheet dari satu versi file workbook, disimpan sebagai
+    tabel sel Arrow (data.colcache.rows_to_table).
+
+    Sheet di-parse saat pertama kali dibaca (table / read / load), sekali
+    per sheet; setiap panggilan load_excel sesudahnya membangun DataFrame
+    langsung dari tabel (grid_frame), tanpa grid list[list] perantara.
+    Membuat snapshot sendiri tidak mem-parse apa pun, jadi page yang cuma
+    butuh metadata / pivot / head, atau backend berbasis file, tidak
+    membayar parse grid.
+
+    Tiap worksheet di-hash (data.xlsxparts.sheet_digests) dan hanya sheet
+    yang digest-nya belum dikenal yang di-parse ulang. Tabel sheet lain
+    diambil dari `sheet_cache` (memori) atau `cache` (ColumnarCache di disk,
+    di-memory-map).
+    """
+
+    def __init__(self, path, version=None, cache=None, flight=None, sheet_cache=None,
+                 parse_workers=1):
+        self.path = Path(path)
+        self.version = version or file_version(self.path)
+        self.cache = cache
+        self.sheet_cache = sheet_cache
+        self.parse_workers = parse_workers
+        self.sha256 = None
+        self.digests = None
+        self.reparsed = []      # sheet yang benar-benar di-parse openpyxl
+        self._names = None
+        self._tables = {}
+        self._lock = threading.Lock()
+        self._flight = flight or SingleFlight()
+
+    # ---------- daftar sheet + digest (tanpa parse) ----------
+    def _ensure_index(self):
+        if self._names is None:
+            self._flight.do(("index", str(self.path), self.version), self._index_once)
+        return self._names
+
+    def _index_once(self):
+        if self._names is not None:
+            return
+
+        if self.cache is None and self.sheet_cache is None:
+            self._names = list_sheet_names(self.path)
+            return
+
+        digests = None
+        if self.cache is not None:
+            self.sha256 = file_sha256(self.path)
+            entries = self.cache.load_manifest(self.sha256)
+            if entries is not None:
+                digests = dict(entries)
+        if digests is None:
+            digests = sheet_digests(self.path)
+            if self.cache is not None:
+                try:
+                    self.cache.store_manifest(self.sha256, digests)
+                except OSError:
+                    # cache cuma optimasi, jangan gagalkan load
+                    pass
+        self.digests = digests
+
+        if self.sheet_cache is not None:
+            # buang tabel sheet yang tidak dipakai snapshot terbaru
+            self.sheet_cache.retain(set(digests.values()))
+
+        self._names = list(digests)
+
+    # ---------- tabel sel per sheet ----------
+    def _ensure_sheets(self, names):
+        missing = [name for name in names if name not in self._tables]
+        if missing:
+            self._flight.do(
+                ("parse", str(self.path), self.version, tuple(missing)),
+                lambda: self._load_tables(missing)
+            )
+
+    def _load_tables(self, names):
+        with self._lock:
+            names = [name for name in names if name not in self._tables]
+            if not names:
+                return
+
+            digests = self.digests or {}
+            tables = {}
+            for name in names:
+                digest = digests.get(name)
+                if digest is None:
+                    continue
+                t = self.sheet_cache.get(digest) if self.sheet_cache else None
+                if t is None and self.cache is not None:
+                    t = self.cache.load_sheet(digest)
+                if t is not None:
+                    tables[name] = t
+
+            missing = [name for name in names if name not in tables]
+            if missing:
+                tables.update(parse_sheets(self.path, missing, workers=self.parse_workers))
+            self.reparsed += missing
+
+            if self.sheet_cache is not None and digests:
+                for name in names:
+                    self.sheet_cache.put(digests[name], tables[name])
+
+            if self.cache is not None and digests:
+                try:
+                    for name in missing:
+                        self.cache.store_sheet(digests[name], tables[name])
+                except OSError:
+                    # cache cuma optimasi, jangan gagalkan load
+                    pass
+
+            self._tables.update(tables)
+
+    def _sheet_name(self, sheet_name):
+        names = self._ensure_index()
+        if isinstance(sheet_name, int):
+            sheet_name = names[sheet_name]
+        if sheet_name not in names:
+            raise ValueError(f"Worksheet named '{sheet_name}' not found")
+        return sheet_name
+
+    def load(self, sheets=None):
+        """
+        Paksa parse sekarang (dipakai refresh di background untuk sheet
+        yang sudah dibaca snapshot sebelumnya).
+
+        sheets : list nama sheet (None = semua); nama yang tidak ada
+                 di versi ini dilewati
+        """
+        names = self._ensure_index()
+        if sheets is not None:
+            names = [name for name in names if name in set(sheets)]
+        self._ensure_sheets(names)
+        return self
+
+    @property
+    def sheet_names(self):
+        return list(self._ensure_index())
+
+    @property
+    def loaded_sheets(self):
+        """
+        Nama sheet yang tabelnya sudah di-parse / dimuat.
+        """
+        return list(self._tables)
+
+    def table(self, sheet_name):
+        sheet_name = self._sheet_name(sheet_name)
+        self._ensure_sheets([sheet_name])
+        return self._tables[sheet_name]
+
+    def rows(self, sheet_name):
+        return table_to_rows(self.table(sheet_name))
+
+    def _frame(self, sheet_name, header, kwargs):
+        if header is None and set(kwargs) <= {"nrows", "usecols"}:
+            df = grid_frame(self.table(sheet_name), **kwargs)
+            if df is not None:
+                return df
+        return rows_to_frame(self.rows(sheet_name), header=header, **kwargs)
+
+    def read(self, sheet_name=0, header=0, **kwargs):
+        """
+        Pengganti pd.read_excel(path, sheet_name=..., **kwargs).
+        sheet_name=None / list -> dict {sheet_name: DataFrame}
+
+        header=None (dengan nrows / usecols saja) dibangun langsung dari
+        tabel sel; argumen lain lewat TextParser di atas grid list[list].
+        """
+        if sheet_name is None:
+            sheet_name = self.sheet_names
+
+        if isinstance(sheet_name, (list, tuple)):
+            # sheet yang belum dimuat di-parse bersama (paralel)
+            self._ensure_sheets([self._sheet_name(name) for name in sheet_name])
+            return {name: self._frame(name, header, kwargs) for name in sheet_name}
+
+        return self._frame(sheet_name, header, kwargs)
+
+
+# =====================================================
+# STORE: STALE-WHILE-REVALIDATE
+# =====================================================
+class WorkbookStore:
+    """
+    Menyimpan snapshot yang sedang dilayani.
+
+    Kalau snapshot sudah lebih tua dari `max_age` detik, thread background
+    mengambil file terbaru (`acquire`), membangun snapshot baru (`build`),
+    mem-parse sheet yang sudah dibaca snapshot lama, lalu menukarnya secara
+    atomik. Sementara itu request user tetap dilayani snapshot lama.
+    Load pertama tidak mem-parse apa pun; sheet di-parse saat dibaca.
+
+    acquire : fungsi() -> path file workbook terbaru
+    build   : fungsi(path) -> WorkbookSnapshot
+    flight  : SingleFlight untuk acquire & load pertama (dibagi antar sesi)
+    pin_dir : kalau diisi, tiap snapshot dibangun dari file pin miliknya
+              sendiri (pin_file), bukan dari path yang ditimpa acquire;
+              semua pembaca snapshot.path melihat isi versi yang sama.
+              Folder ini milik satu store: pin sisa proses sebelumnya
+              (mis. yang crash) dihapus saat store dibuat
+    """
+
+    def __init__(self, acquire, build, max_age, flight=None, pin_dir=None):
+        self.acquire = acquire
+        self.build = build
+        self.max_age = max_age
+        self.pin_dir = Path(pin_dir) if pin_dir is not None else None
+        self._flight = flight or SingleFlight()
+
+        self._snapshot = None
+        self._retired = None      # snapshot sebelumnya, mungkin masih dipakai rerun yang jalan
+        self.loaded_at = None     # kapan snapshot yang dilayani dibangun
+        self.checked_at = None    # kapan versi file terakhir dicek
+        self.last_error = None
+
+        self._lock = threading.Lock()
+        self._refreshing = False
+
+        if self.pin_dir is not None:
+            self._sweep_pins()
+
+    def _sweep_pins(self):
+        if not self.pin_dir.is_dir():
+            return
+        for path in self.pin_dir.iterdir():
+            if path.is_file():
+                self._unpin(path)
+
+    @property
+    def ready(self):
+        return self._snapshot is not None
+
+    def current(self):
+        snap = self._snapshot
+
+        if snap is None:
+            # load pertama: belum ada yang bisa dilayani, semua sesi menunggu
+            # satu load yang sama
+            snap = self._flight.do("first-load", self._first_load)
+
+        elif time.time() - self.checked_at > self.max_age:
+            self.refresh()
+
+        return snap
+
+    def _first_load(self):
+        if self._snapshot is None:
+            snap = self._build(self._acquire())
+            with self._lock:
+                self._snapshot = snap
+                self.loaded_at = self.checked_at = time.time()
+        return self._snapshot
+
+    def _acquire(self):
+        return self._flight.do("acquire", self.acquire)
+
+    def _build(self, path, sheets=()):
+        """
+        sheets : sheet yang langsung di-parse (sisanya saat dibaca)
+        """
+        if self.pin_dir is not None:
+            path = pin_file(path, self.pin_dir)
+        try:
+            snap = self.build(path)
+            if sheets:
+                snap.load(sheets)
+            return snap
+        except BaseException:
+            self._unpin(path)
+            raise
+
+    def _unpin(self, path):
+        if self.pin_dir is None or Path(path).parent != self.pin_dir:
+            return
+        try:
+            Path(path).unlink(missing_ok=True)
+        except OSError:
+            # Windows: file masih dibuka pembaca lain, biarkan
+            pass
+
+    def _swap(self, snap):
+        with self._lock:
+            old, self._snapshot = self._snapshot, snap
+            self.loaded_at = time.time()
+            stale, self._retired = self._retired, old
+        # satu generasi lama tetap ada untuk rerun yang masih memegangnya
+        if stale is not None:
+            self._unpin(stale.path)
+
+    def refresh(self):
+        """
+        Mulai refresh di background (tidak menunggu).
+        """
+        with self._lock:
+            if self._refreshing or self._snapshot is None:
+                return
+            self._refreshing = True
+
+        threading.Thread(
+            target=self._refresh,
+            name="workbook-refresh",
+            daemon=True
+        ).start()
+
+    def _refresh(self):
+        try:
+            path = self._acquire()
+            old = self._snapshot
+            if file_version(path) != old.version:
+                # sheet yang sudah dipakai page tetap siap setelah swap
+                self._swap(self._build(path, old.loaded_sheets))
+            self.last_error = None
+        except Exception as e:
+            # tetap layani snapshot lama, coba lagi setelah max_age
+            self.last_error = e
+        finally:
+            with self._lock:
+                self.checked_at = time.time()
+                self._refreshing = False
+
+    def status(self):
+        now = time.time()
+        snap = self._snapshot
+        return {
+            "ready": snap is not None,
+            "version": snap.version if snap else None,
+            "age": now - self.loaded_at if self.loaded_at else None,
+            "checked_age": now - self.checked_at if self.checked_at else None,
+            "refreshing": self._refreshing,
+            "error": str(self.last_error) if self.last_error else None,
+        }
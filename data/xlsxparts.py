@@ -0,0 +1,248 @@
+# data/xlsxparts.py
+import hashlib
+import posixpath
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+
+NS_MAIN = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+NS_REL = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+NS_PKG_REL = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+# naikkan kalau cara menghitung digest berubah
+DIGEST_VERSION = b"sheet-digest-1"
+
+_RE_SHARED_CELL = re.compile(rb'<(?:\w+:)?c\b[^>]*\bt="s"[^>]*>\s*<(?:\w+:)?v>(\d+)</')
+_RE_STYLE_ATTR = re.compile(rb'<(?:\w+:)?c\b[^>]*?\ss="(\d+)"')
+
+
+# =====================================================
+# NAVIGASI PART DI DALAM ZIP
+# =====================================================
+def _rels_path(part):
+    folder, name = posixpath.split(part)
+    return posixpath.join(folder, "_rels", name + ".rels")
+
+
+def read_rels(zf, part):
+    """
+    return : dict {rId: (target_part, type)} untuk relasi milik `part`
+    """
+    path = _rels_path(part)
+    if path not in zf.namelist():
+        return {}
+
+    root = ET.fromstring(zf.read(path))
+    folder = posixpath.dirname(part)
+    rels = {}
+    for rel in root.iter(f"{NS_PKG_REL}Relationship"):
+        target = rel.get("Target", "")
+        if rel.get("TargetMode") == "External":
+            continue
+        if target.startswith("/"):
+            target = target.lstrip("/")
+        else:
+            target = posixpath.normpath(posixpath.join(folder, target))
+        rels[rel.get("Id")] = (target, rel.get("Type", ""))
+    return rels
+
+
+def sheet_parts(zf):
+    """
+    return : list [(sheet_name, "xl/worksheets/sheetN.xml")] sesuai urutan workbook
+    """
+    root = ET.fromstring(zf.read("xl/workbook.xml"))
+    rels = read_rels(zf, "xl/workbook.xml")
+    parts = []
+    for sheet in root.iter(f"{NS_MAIN}sheet"):
+        target, rel_type = rels.get(sheet.get(f"{NS_REL}id"), (None, ""))
+        if target and rel_type.endswith("/worksheet"):
+            parts.append((sheet.get("name"), target))
+    return parts
+
+
+def _date1904(zf):
+    root = ET.fromstring(zf.read("xl/workbook.xml"))
+    pr = root.find(f"{NS_MAIN}workbookPr")
+    return b"1" if pr is not None and pr.get("date1904") in ("1", "true") else b"0"
+
+
+def shared_strings(zf):
+    if "xl/sharedStrings.xml" not in zf.namelist():
+        return []
+
+    out = []
+    with zf.open("xl/sharedStrings.xml") as f:
+        for _, el in ET.iterparse(f):
+            if el.tag == f"{NS_MAIN}si":
+                out.append("".join(t.text or "" for t in el.iter(f"{NS_MAIN}t")))
+                el.clear()
+    return out
+
+
+def style_formats(zf):
+    """
+    return : list, index = style id (atribut s="N" di sel), isi = numFmt
+             (id bawaan Excel atau formatCode custom)
+    """
+    if "xl/styles.xml" not in zf.namelist():
+        return []
+
+    root = ET.fromstring(zf.read("xl/styles.xml"))
+    custom = {
+        nf.get("numFmtId"): nf.get("formatCode", "")
+        for nf in root.iter(f"{NS_MAIN}numFmt")
+    }
+    xfs = root.find(f"{NS_MAIN}cellXfs")
+    if xfs is None:
+        return []
+
+    out = []
+    for xf in xfs.iter(f"{NS_MAIN}xf"):
+        fmt_id = xf.get("numFmtId", "0")
+        out.append(custom.get(fmt_id, f"builtin:{fmt_id}"))
+    return out
+
+
+# =====================================================
+# DIGEST ISI PER SHEET
+# =====================================================
+def sheet_digests(path):
+    """
+    Hash isi tiap worksheet tanpa mem-parse sel dengan openpyxl.
+
+    Digest sebuah sheet = XML sheet + shared strings yang DIRUJUK sheet itu
+    + format angka dari style yang dirujuk + flag date1904. String / style
+    baru di sheet lain tidak mengubah digest sheet ini.
+
+    return : dict {sheet_name: hex digest} (urutan sesuai workbook)
+    """
+    with zipfile.ZipFile(path) as zf:
+        parts = sheet_parts(zf)
+        strings = None
+        formats = None
+        date1904 = _date1904(zf)
+
+        digests = {}
+        for name, part in parts:
+            data = zf.read(part)
+
+            h = hashlib.sha256(DIGEST_VERSION)
+            h.update(date1904)
+            h.update(hashlib.sha256(data).digest())
+
+            idx = sorted({int(i) for i in _RE_SHARED_CELL.findall(data)})
+            if idx:
+                if strings is None:
+                    strings = shared_strings(zf)
+                for i in idx:
+                    h.update(b"\x00s%d\x00" % i)
+                    h.update((strings[i] if i < len(strings) else "").encode("utf-8"))
+
+            styles = sorted({int(i) for i in _RE_STYLE_ATTR.findall(data)})
+            if styles:
+                if formats is None:
+                    formats = style_formats(zf)
+                for i in styles:
+                    h.update(b"\x00f%d\x00" % i)
+                    h.update((formats[i] if i < len(formats) else "").encode("utf-8"))
+
+            digests[name] = h.hexdigest()
+
+    return digests
+
+
+# =====================================================
+# METADATA SHEET (TANPA PARSE SEL / DATAFRAME)
+# =====================================================
+def sheet_dimension(zf, part):
+    """
+    return : ref <dimension> sheet ("A1:J12"), None kalau tidak ada.
+             Berhenti membaca begitu <sheetData> mulai.
+    """
+    with zf.open(part) as f:
+        for _, el in ET.iterparse(f, events=("start",)):
+            if el.tag == f"{NS_MAIN}dimension":
+                return el.get("ref")
+            if el.tag == f"{NS_MAIN}sheetData":
+                return None
+    return None
+
+
+def _empty_shared(zf):
+    return {i for i, s in enumerate(shared_strings(zf)) if s == ""}
+
+
+def _cell_has_value(c, empty_shared):
+    # kosong sama seperti openpyxl -> sheetgrid._convert_cell menghasilkan ""
+    t = c.get("t", "n")
+    if t == "inlineStr":
+        inline = c.find(f"{NS_MAIN}is")
+        return inline is not None and any(x.text for x in inline.iter(f"{NS_MAIN}t"))
+
+    v = c.findtext(f"{NS_MAIN}v")
+    if not v:
+        return False
+    if t == "s":
+        return int(v) not in empty_shared()
+    return True
+
+
+def last_data_row(zf, part, empty_shared):
+    """
+    Streaming <row> satu per satu tanpa menyimpannya.
+
+    empty_shared : function() -> set index shared string yang isinya ""
+    return       : nomor baris (1-based) terakhir yang punya sel berisi, 0 kalau kosong
+    """
+    last = 0
+    row_number = 0
+    with zf.open(part) as f:
+        for _, el in ET.iterparse(f):
+            if el.tag != f"{NS_MAIN}row":
+                continue
+            row_number = int(el.get("r") or row_number + 1)
+            if any(_cell_has_value(c, empty_shared) for c in el.iter(f"{NS_MAIN}c")):
+                last = row_number
+            el.clear()
+    return last
+
+
+def sheet_metadata(path, sheets=None):
+    """
+    Ukuran sheet langsung dari XML, tanpa openpyxl maupun DataFrame.
+
+    return : dict {sheet_name: {"dimension": ref <dimension> atau None,
+                                "last_row": baris terakhir yang berisi}}
+
+    <dimension> ikut menghitung sel kosong yang diberi format, jadi jumlah
+    baris diambil dari last_row (sama dengan grid sheetgrid.sheet_rows).
+    """
+    with zipfile.ZipFile(path) as zf:
+        parts = dict(sheet_parts(zf))
+        names = list(parts) if sheets is None else list(sheets)
+
+        cache = {}
+
+        def empty_shared():
+            if "set" not in cache:
+                cache["set"] = _empty_shared(zf)
+            return cache["set"]
+
+        out = {}
+        for name in names:
+            if name not in parts:
+                raise ValueError(f"Worksheet named '{name}' not found")
+            out[name] = {
+                "dimension": sheet_dimension(zf, parts[name]),
+                "last_row": last_data_row(zf, parts[name], empty_shared),
+            }
+    return out
+
+
+def data_row_count(meta, header=0):
+    """
+    return : jumlah baris DataFrame dari load_excel(sheet, header=header),
+             yaitu baris setelah baris header sampai baris terakhir yang berisi
+    """
+    return max(meta["last_row"] - (header + 1), 0)
@@ -7,9 +7,20 @@ import altair as alt
 import streamlit.components.v1 as components
 import re
 
-from config import SHEET_NAME_REVKAB, load_excel
-from data.revbykab import load_clean_revbykab
-from ui.filters import checkbox_group_no_blank, apply_filters_general
+from config import workbook_version
+from data.revbykab import (
+    load_revbykab_cube,
+    load_revbykab_dataset,
+    load_revbykab_filters,
+    month_columns,
+    select_month_columns,
+)
+from ui.filters import (
+    checkbox_group_no_blank,
+    filter_rows,
+    filter_view,
+    month_range_slider,
+)
 from ui.tables import df_to_colored_html, df_to_plain_html
 
 # =========================================================
@@ -32,54 +43,26 @@ def render():
     count_placeholder = st.empty()
 
     # ---------------------------
-    # LOAD DATA (PERCENT + VALUE PARSER)
+    # LOAD DATA (BERSIH, CACHE PER VERSI WORKBOOK: data/revbykab.py)
     # ---------------------------
-    df_pct_raw, df_val_raw = load_clean_revbykab(
-        load_excel,
-        sheet_name=SHEET_NAME_REVKAB
-    )
-
-    # ---------------------------
-    # NORMALIZATION (IDENTIK ORIGINAL)
-    # ---------------------------
-    def norm_route(v):
-        if pd.isna(v):
-            return np.nan
-        if isinstance(v, str):
-            s = v.strip().upper()
-            return s if s != "" else np.nan
-        return np.nan
-
-    for df in (df_pct_raw, df_val_raw):
-        if df is not None:
-            if "Route" in df.columns:
-                df["Route"] = df["Route"].apply(norm_route)
-
-            for col in ("Pulau", "Provinsi"):
-                if col in df.columns:
-                    df[col] = (
-                        df[col]
-                        .apply(lambda x: x.strip() if isinstance(x, str) and x.strip() != "" else np.nan)
-                        .ffill()
-                    )
+    version = workbook_version()
+    df_pct_raw, df_val_raw = load_revbykab_dataset(version)
+    idx_pct, idx_val = load_revbykab_filters(version)
 
     # ---------------------------
     # FILTER SOURCE (PERCENT PRIORITY)
     # ---------------------------
-    src = (
-        df_pct_raw
-        if df_pct_raw is not None and not df_pct_raw.empty
-        else df_val_raw
-    )
+    # opsi dari index filter (data/filterindex.py), tanpa unique() per rerun
+    src = idx_pct if idx_pct is not None else idx_val
 
-    if src is None or src.empty:
+    if src is None:
         st.info("Tidak ada data")
         return
 
     # ---------------------------
     # SIDEBAR FILTERS
     # ---------------------------
-    pulau_opts = sorted(src["Pulau"].dropna().unique().tolist())
+    pulau_opts = src.options("Pulau")
 
     sel_pulau = checkbox_group_no_blank(
         "pulau", "Pulau",
@@ -88,22 +71,17 @@ def render():
         expanded=True
     )
 
-    if sel_pulau:
-        prov_opts = (
-            src[src["Pulau"].isin(sel_pulau)]["Provinsi"]
-            .dropna().unique().tolist()
-        )
-    else:
-        prov_opts = src["Provinsi"].dropna().unique().tolist()
+    # di-cache per seleksi Pulau
+    prov_opts = src.options("Provinsi", within=("Pulau", sel_pulau))
 
     sel_prov = checkbox_group_no_blank(
         "prov", "Provinsi",
-        sorted(prov_opts),
+        prov_opts,
         default_all=False,
         expanded=False
     )
 
-    route_opts = sorted(src["Route"].dropna().unique().tolist())
+    route_opts = src.options("Route")
 
     sel_route = checkbox_group_no_blank(
         "route", "Route",
@@ -113,60 +91,51 @@ def render():
     )
 
     # ---------------------------
-    # APPLY FILTERS
+    # RENTANG BULAN: hanya kolom terpilih yang disalin, di-cek & dirender
     # ---------------------------
-    df_pct_f = apply_filters_general(df_pct_raw, sel_pulau, sel_prov, sel_route)
-    df_val_f = apply_filters_general(df_val_raw, sel_pulau, sel_prov, sel_route)
+    months = month_columns(df_pct_raw if idx_pct is not None else df_val_raw)
+    sel_months = month_range_slider("Rentang Bulan", months)
 
     # =========================================================
     # GRAPH MODE
     # =========================================================
     if mode == "Graph":
-        if df_pct_f is None or df_pct_f.empty:
+        # agregat per versi workbook (data/cube.py): filter cukup memilih
+        # baris kunci, KPI & bar dibaca dari satu bulan tanpa melt
+        cube = load_revbykab_cube(version)
+        if cube is None:
             st.info("Tidak ada data untuk grafik")
             return
 
-        pct_cols = []
-        for c in df_pct_f.columns:
-            if c in ("Pulau", "Provinsi", "Kab Kota", "Route", "Type"):
-                continue
-            s = pd.to_numeric(df_pct_f[c], errors="coerce")
-            if s.notna().sum() > 0 and s.max() <= 1.5:
-                pct_cols.append(c)
+        pct_rows = filter_rows(df_pct_raw, sel_pulau, sel_prov, sel_route, index=idx_pct)
+        rows = np.arange(len(cube)) if pct_rows is None else cube.key_rows(pct_rows)
+        if len(rows) == 0:
+            st.info("Tidak ada data untuk grafik")
+            return
+
+        pct_cols = cube.months_with_data(rows, max_share=1.5, months=sel_months)
 
         if not pct_cols:
             st.info("Tidak ada kolom persentase")
             return
 
-        id_cols = [c for c in ["Kab Kota", "Route"] if c in df_pct_f.columns]
-
-        df_long = (
-            df_pct_f[id_cols + pct_cols]
-            .melt(id_vars=id_cols, var_name="Month", value_name="Share")
-            .dropna(subset=["Share"])
-        )
-
         last_month = pct_cols[-1]
 
         # Gunakan SEMUA Kab/Kota hasil filter Pulau / Provinsi
-        df_plot = df_long.copy()
-
-        df_last = df_plot[df_plot["Month"] == last_month]
-        kpi = df_last.groupby("Route")["Share"].mean()
+        kpi = cube.mean_by(rows, last_month, ["Route"]).set_index("Route")["Share"]
 
         c1, c2, c3 = st.columns([1, 1, 6])
         c1.metric("Avg TASTI", f"{kpi.get('TASTI', 0) * 100:.1f}%")
         c2.metric("Avg DIRECT", f"{kpi.get('DIRECT', 0) * 100:.1f}%")
         c3.markdown("Stacked bar = pangsa TASTI vs DIRECT per Kab/Kota")
 
-        df_bar = (
-            df_last.groupby(["Kab Kota", "Route"], as_index=False)["Share"]
-            .mean()
-        )
+        df_bar = cube.mean_by(rows, last_month, ["Kab Kota", "Route"])
 
         # 🔒 kunci urutan stack (UNTUK POSISI)
         STACK_ORDER = {"DIRECT": 0, "TASTI": 1}
-        df_bar["stack_order"] = df_bar["Route"].map(STACK_ORDER)
+        # Route bisa category (data/compact.py): map -> category juga,
+        # padahal alt.Order butuh angka (:Q)
+        df_bar["stack_order"] = df_bar["Route"].map(STACK_ORDER).astype(float)
 
         # label
         df_bar["label"] = (
@@ -237,25 +206,25 @@ def render():
         chart = (bars + labels).properties(height=420)
         st.altair_chart(chart, use_container_width=True)
 
-        count_placeholder.write(f"Menampilkan **{len(df_plot)}** baris (graph)")
+        count_placeholder.write(f"Menampilkan **{cube.count(rows, pct_cols)}** baris (graph)")
         return
 
     # =========================================================
     # PERCENTAGE MODE
     # =========================================================
     if mode == "Percentage":
-        if df_pct_f is None or df_pct_f.empty:
+        # filter = posisi baris (ui/filters.py), frame baru dibentuk sekali di sini
+        view = filter_view(df_pct_raw, sel_pulau, sel_prov, sel_route, index=idx_pct)
+        if view is None or view.empty:
             st.info("Tidak ada data")
             return
 
-        pct_cols = [
-            c for c in df_pct_f.columns
-            if c not in ("Pulau", "Provinsi", "Kab Kota", "Route", "Type")
-        ]
+        df_pct_f = view.frame(select_month_columns(df_pct_raw.columns, months, sel_months))
+
+        pct_cols = month_columns(df_pct_f)
 
-        df_html = df_pct_f.copy()
-        for c in pct_cols:
-            df_html[c] = pd.to_numeric(df_html[c], errors="coerce")
+        # kolom persentase sudah float dari skema (config.SHEET_SCHEMAS)
+        df_html = df_pct_f
 
         html = df_to_colored_html(df_html, pct_cols)
         components.html(html, height=1100, scrolling=True)
@@ -268,75 +237,23 @@ def render():
     # =========================================================
     if mode == "Value":
 
-        # --- STEP 1: READ VALUE TABLE ---
-        try:
-            df_val_direct = load_excel(
-                sheet_name=SHEET_NAME_REVKAB,
-                header=364
-            )
-        except Exception:
-            df_val_direct = None
-
-        # --- STEP 2: SIMPLE CANONICALIZE ---
-        def simple_canonicalize(df):
-            if df is None or df.empty:
-                return df
-
-            lower_map = {str(c).lower(): c for c in df.columns}
-            col_map = {}
-
-            for k, orig in lower_map.items():
-                if "pulau" in k:
-                    col_map[orig] = "Pulau"
-                elif "prov" in k:
-                    col_map[orig] = "Provinsi"
-                elif "kab" in k or "kota" in k:
-                    col_map[orig] = "Kab Kota"
-                elif "route" in k:
-                    col_map[orig] = "Route"
-                elif "type" in k:
-                    col_map[orig] = "Type"
-
-            if col_map:
-                df = df.rename(columns=col_map)
-
-            for col in ("Pulau", "Provinsi"):
-                if col in df.columns:
-                    df[col] = (
-                        df[col]
-                        .apply(lambda x: x.strip() if isinstance(x, str) and x.strip() != "" else np.nan)
-                        .ffill()
-                    )
-
-            if "Route" in df.columns:
-                df["Route"] = df["Route"].apply(
-                    lambda v: v.strip().upper()
-                    if isinstance(v, str) and v.strip() != ""
-                    else np.nan
-                )
-
-            return df
+        # --- STEP 1: VALUE TABLE (DARI PARSE YANG SAMA DENGAN PERSENTASE) ---
+        df_val_direct = df_val_raw
 
+        # --- STEP 2: CANONICALIZE (SUDAH DI LOADER) ---
         df_val_for_display = None
 
         if df_val_direct is not None and not df_val_direct.empty:
-            df_val_direct = simple_canonicalize(df_val_direct)
             if any(c in df_val_direct.columns for c in ("Pulau", "Provinsi", "Kab Kota", "Route")):
-                df_val_for_display = apply_filters_general(
-                    df_val_direct, sel_pulau, sel_prov, sel_route
-                )
-
-        if (df_val_for_display is None or df_val_for_display.empty) and df_val_f is not None:
-            df_val_tmp = simple_canonicalize(df_val_f.copy())
-            df_val_for_display = apply_filters_general(
-                df_val_tmp, sel_pulau, sel_prov, sel_route
-            )
+                df_val_for_display = filter_view(
+                    df_val_direct, sel_pulau, sel_prov, sel_route, index=idx_val
+                ).frame(select_month_columns(df_val_direct.columns, months, sel_months))
 
         if df_val_for_display is None:
             df_val_for_display = pd.DataFrame()
 
         # --- STEP 3: COERCE NUMERIC SAFELY ---
-        df_disp = df_val_for_display.copy()
+        df_disp = df_val_for_display.copy(deep=False)
         for c in df_disp.columns:
             try:
                 if df_disp[c].dtype == object:
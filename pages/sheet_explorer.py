@@ -1,17 +1,18 @@
 import streamlit as st
 import pandas as pd
-from config import load_excel
+from config import list_excel_sheets, load_excel_head, load_pivot_facts, pivot_sheets
 
 
 def render():
     st.title("📑 Sheet Explorer")
 
+    MAX_ROWS = 3000
+
     # =========================
-    # LOAD ALL SHEETS (DICT)
+    # DAFTAR SHEET (TANPA PARSE ISI)
     # =========================
     try:
-        sheets = load_excel(sheet_name=None)
-        sheet_names = list(sheets.keys())
+        sheet_names = list_excel_sheets()
     except Exception as e:
         st.error(f"Gagal membaca daftar sheet Excel: {e}")
         return
@@ -21,18 +22,55 @@ def render():
     if not selected_sheet:
         return
 
-    df = sheets[selected_sheet]
+    # =========================
+    # PIVOT CACHE (KALAU SHEET BERISI PIVOT)
+    # =========================
+    try:
+        pivots = pivot_sheets()
+    except Exception:
+        pivots = {}
+
+    view = "Layout sheet"
+    if selected_sheet in pivots:
+        view = st.radio(
+            "Tampilan:",
+            ["Layout sheet", "Fact table (pivot cache)"],
+            horizontal=True
+        )
+
+    if view != "Layout sheet":
+        try:
+            df = load_pivot_facts(selected_sheet)
+        except Exception as e:
+            st.error(f"Gagal membaca pivot cache {selected_sheet}: {e}")
+            return
+
+        st.caption(
+            f"Pivot cache: **{selected_sheet}** | "
+            f"Records: **{len(df)}** | "
+            f"Fields: **{df.shape[1]}**"
+        )
+        st.dataframe(df, use_container_width=True, height=600)
+        return
+
+    # =========================
+    # STREAMING, MAKS MAX_ROWS BARIS
+    # =========================
+    try:
+        df, total_rows = load_excel_head(selected_sheet, MAX_ROWS)
+    except Exception as e:
+        st.error(f"Gagal membaca sheet {selected_sheet}: {e}")
+        return
 
     st.caption(
         f"Sheet: **{selected_sheet}** | "
-        f"Rows: **{df.shape[0]}** | "
+        f"Rows: **{total_rows}** | "
         f"Columns: **{df.shape[1]}**"
     )
 
-    MAX_ROWS = 3000
-    st.info(f"Menampilkan {min(len(df), MAX_ROWS)} dari {len(df)} baris")
+    st.info(f"Menampilkan {len(df)} dari {total_rows} baris")
 
-    df = df.copy()
+    df = df.copy(deep=False)
     df.columns = df.columns.astype(str)
 
     for c in df.columns:
@@ -40,7 +78,7 @@ def render():
             df[c] = df[c].astype(str)
 
     st.dataframe(
-        df.head(MAX_ROWS),
+        df,
         use_container_width=True,
         height=600
     )
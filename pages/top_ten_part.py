@@ -3,7 +3,8 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import streamlit.components.v1 as components
-from config import load_excel, SHEET_NAME_TOPPART
+from config import compact_dataset, load_excel, shared_dataset, workbook_version, SHEET_NAME_TOPPART, SHEET_SCHEMAS
+from data.schema import read_schema
 from ui.tables import df_to_plain_html
 import altair as alt
 
@@ -57,26 +58,77 @@ def style_trend(val):
 # ===============================
 # 🔑 TREND CALCULATION
 # ===============================
-def compute_trend_from_years(years, revenues):
+YEAR_MAP = {
+    "2023": "",
+    "2024": ".1",
+    "2025": ".2"
+}
+
+BASE_MONTHS = [
+    "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December"
+]
+
+
+def yearly_totals(df, years):
+    """
+    years  : list[int]
+    return : ndarray (baris df x years), total bulan per tahun (NaN = 0,
+             tahun tanpa kolom bulan = 0)
+    """
+    out = np.zeros((len(df), len(years)))
+    for j, year in enumerate(years):
+        suffix = YEAR_MAP[str(year)]
+        # dijumlah kolom demi kolom (urutan bulan), sama dengan Series.sum per baris
+        for m in BASE_MONTHS:
+            col = f"{m}{suffix}"
+            if col in df.columns:
+                out[:, j] += np.nan_to_num(df[col].to_numpy(dtype=float, na_value=np.nan))
+    return out
+
+
+def compute_trends(years, revenues):
     """
     years     : list[int]
-    revenues  : list[float]
-    return    : float (slope / avg)
+    revenues  : ndarray (baris x years)
+    return    : ndarray float per baris (slope / avg),
+                NaN kalau avg = 0, 0 kalau tahun < 2
     """
+    revenues = np.ascontiguousarray(revenues, dtype=float)
     if len(years) < 2:
-        return np.nan
+        return np.zeros(len(revenues))
 
     x = np.array(years, dtype=float)
-    y = np.array(revenues, dtype=float)
+    xc = x - x.mean()
 
-    if y.mean() == 0:
-        return np.nan
+    y_mean = revenues.mean(axis=1)
+    slope = ((revenues - y_mean[:, None]) * xc).sum(axis=1) / np.sum(xc ** 2)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(y_mean == 0, np.nan, slope / y_mean)
+
+
+def load_trends(version, years):
+    """
+    Trend semua baris Top10Part untuk satu cakupan tahun, sekali per
+    (versi workbook, cakupan) untuk semua sesi.
+
+    return : Series float, index sama dengan load_topten_part(version)
+    """
+    years = tuple(years)
+    return shared_dataset(
+        ("topten_trend", version, years),
+        lambda: _build_trends(version, years)
+    )
 
-    x_mean = x.mean()
-    y_mean = y.mean()
 
-    slope = np.sum((x - x_mean) * (y - y_mean)) / np.sum((x - x_mean) ** 2)
-    return slope / y_mean
+def _build_trends(version, years):
+    df = load_topten_part(version)
+    return pd.Series(
+        compute_trends(years, yearly_totals(df, years)),
+        index=df.index,
+        name="Trend"
+    )
 
 
 # ===============================
@@ -93,28 +145,19 @@ def get_trend_years(selected_year):
         return [2023, 2024, 2025]
 
 
-@st.cache_data(show_spinner="Loading Top Ten Part Number...")
-def load_topten_part():
-    df_top_raw = load_excel(
-        sheet_name=SHEET_NAME_TOPPART,
-        skiprows=5
-    )
+def load_topten_part(version):
+    # satu objek untuk semua sesi, pemanggil dapat salinan dangkal
+    return shared_dataset(("topten_part", version), _build_topten_part)
 
-    # ===============================
-    # DROP KOLOM SETELAH TREND (ANCHOR-BASED, AMAN)
-    # ===============================
-    cols = [str(c).strip() for c in df_top_raw.columns]
 
-    if "Trend" in cols:
-        trend_idx = cols.index("Trend")
-        cols_to_drop = cols[trend_idx + 1 :]
-    else:
-        cols_to_drop = []
+def _build_topten_part():
+    with st.spinner("Loading Top Ten Part Number..."):
+        return _clean_topten_part()
 
-    df_top = df_top_raw.drop(columns=cols_to_drop, errors="ignore")
 
-    df_top = df_top.loc[:, ~df_top.columns.astype(str).str.startswith("Unnamed")]
-    df_top.columns = [str(c).strip() for c in df_top.columns]
+def _clean_topten_part():
+    # header, kolom s/d Trend & kolom bulan numerik: config.SHEET_SCHEMAS
+    df_top = read_schema(load_excel, SHEET_NAME_TOPPART, SHEET_SCHEMAS[SHEET_NAME_TOPPART])
     df_top = df_top.dropna(how="all")
 
     col_map = {}
@@ -215,18 +258,6 @@ def load_topten_part():
 
     df_top = df_top[existing + others]
 
-    # ===============================
-    # FORCE numeric untuk semua kolom bulan & total
-    # ===============================
-    MONTH_PREFIXES = [
-        "January", "February", "March", "April", "May", "June",
-        "July", "August", "September", "October", "November", "December"
-    ]
-
-    for c in df_top.columns:
-        if any(c.startswith(m) for m in MONTH_PREFIXES):
-            df_top[c] = pd.to_numeric(df_top[c], errors="coerce")
-
     # ===============================
     # Pindahkan Trend ke paling kanan
     # ===============================
@@ -234,7 +265,11 @@ def load_topten_part():
         cols = [c for c in df_top.columns if c != "Trend"]
         df_top = df_top[cols + ["Trend"]]
 
-    return df_top
+    # identitas -> category / intern; bulan tetap float64 (data/compact.py)
+    return compact_dataset(
+        "Top10Part", df_top,
+        dims=["Branch", "ID Code", "Customer", "Part Number"]
+    )
 
 MONTH_COLS = [
     "January", "February", "March", "April", "May", "June",
@@ -266,29 +301,19 @@ def render():
     st.title("🏆 Top Ten Part Number")
 
     # 🔒 1. DATA PALING MENTAH (TIDAK BOLEH TERSENTUH FILTER)
-    df_all = load_topten_part()
+    df_all = load_topten_part(workbook_version())
 
     if df_all.empty:
         st.warning("Data kosong")
         return
 
     # 🔹 2. DATA KERJA (INI YANG AKAN DI-FILTER)
-    df = df_all.copy()
+    df = df_all.copy(deep=False)
 
-    # 🔹 3. DATA KHUSUS TREND (PAKAI RAW, JANGAN FILTER)
-    df_raw = df_all
+    # 🔹 3. TREND DIHITUNG DARI DATA RAW (load_trends), BUKAN DARI df TERFILTER
      
     # ================= YEAR FILTER (REAL FIX) =================
-    YEAR_MAP = {
-        "2023": "",
-        "2024": ".1",
-        "2025": ".2"
-    }
-
-    BASE_MONTHS = [
-        "January", "February", "March", "April", "May", "June",
-        "July", "August", "September", "October", "November", "December"
-    ]
+    # YEAR_MAP / BASE_MONTHS: level modul (dipakai juga oleh load_trends)
 
     # ================= FILTER BAR =================
     idcode_opts = ["ALL"] + sorted(df["ID Code"].dropna().unique().tolist())
@@ -331,7 +356,7 @@ def render():
     if selected_cust != "ALL":
         df = df_id[df_id["Customer"] == selected_cust]
     else:
-        df = df_id.copy()
+        df = df_id.copy(deep=False)
 
     # ================= MODE TOGGLE =================
     mode = st.radio(
@@ -340,15 +365,10 @@ def render():
         horizontal=True
     )
 
-    BASE_MONTHS = [
-        "January", "February", "March", "April", "May", "June",
-        "July", "August", "September", "October", "November", "December"
-    ]
-
     # ================= TABLE MODE =================
     if mode == "📋 Table":
 
-        df = df.copy()
+        df = df.copy(deep=False)
 
         if selected_year == "ALL":
             # ===============================
@@ -383,38 +403,15 @@ def render():
         # =============================
         # 2.5 HITUNG TOTAL (DERIVED, AMAN)
         # =============================
-        df = df.copy()
+        df = df.copy(deep=False)
 
         if month_cols:
             df["Total"] = df[month_cols].sum(axis=1, skipna=True)
 
             if selected_year != "ALL":
-
-                trend_values = []
-                trend_years = get_trend_years(selected_year)
-
-                for idx in df.index:
-                    row = df_raw.loc[idx]
-
-                    years = []
-                    revenues = []
-
-                    for year in trend_years:
-                        suffix = YEAR_MAP[str(year)]
-                        year_months = [
-                            f"{m}{suffix}"
-                            for m in BASE_MONTHS
-                            if f"{m}{suffix}" in df_raw.columns
-                        ]
-
-                        year_total = row[year_months].sum(skipna=True)
-                        years.append(year)
-                        revenues.append(year_total or 0)
-
-                    trend = 0 if len(years) < 2 else compute_trend_from_years(years, revenues)
-                    trend_values.append(trend)
-
-                df["Trend"] = trend_values
+                # semua baris sekaligus, cache per (versi, cakupan tahun)
+                trend = load_trends(workbook_version(), get_trend_years(selected_year))
+                df["Trend"] = trend.reindex(df.index).to_numpy()
 
         # =============================
         # 3. Kolom FINAL yang ditampilkan
@@ -436,7 +433,7 @@ def render():
         df_show = (
             df[display_cols]
             .sort_values("Total", ascending=False)
-            .groupby("Customer", group_keys=False)
+            .groupby("Customer", group_keys=False, observed=True)
             .head(top_n)
         )
 
@@ -483,13 +480,7 @@ def render():
         # ===============================
         # BUILD MONTH LIST BASED ON YEAR
         # ===============================
-        MONTHS_FULL = [
-            ("2023", "January", "Jan", ""),
-            ("2024", "January", "Jan", ".1"),
-            ("2025", "January", "Jan", ".2"),
-        ]
-
-        BASE_MONTHS = [
+        MONTH_SHORT = [
             ("January", "Jan"),
             ("February", "Feb"),
             ("March", "Mar"),
@@ -507,46 +498,19 @@ def render():
         month_rows = []
 
         for year, suffix in YEAR_MAP.items():
-            # =============================
-            # DERIVED TREND (FINAL FIX)
-            # =============================
-            if selected_year != "ALL":
-
-                trend_values = []
-                trend_years = get_trend_years(selected_year)
-
-                for idx in df.index:
-                    row = df_raw.loc[idx]   # ⬅️ DI SINI TEMPATNYA
-
-                    years = []
-                    revenues = []
-
-                    for year in trend_years:
-                        suffix = YEAR_MAP[str(year)]
-
-                        year_months = [
-                            f"{m}{suffix}"
-                            for m in BASE_MONTHS
-                            if f"{m}{suffix}" in df_raw.columns
-                        ]
-
-                        if not year_months:
-                            continue
-
-                        year_total = row[year_months].sum(skipna=True)
-
-                        years.append(year)
-                        revenues.append(0 if pd.isna(year_total) else float(year_total))
-
-                    # aturan bisnis kamu
-                    if len(years) < 2:
-                        trend = 0
-                    else:
-                        trend = compute_trend_from_years(years, revenues)
-
-                    trend_values.append(trend)
-
-                df["Trend"] = trend_values
+            for month, short in MONTH_SHORT:
+                col = f"{month}{suffix}"
+                if col in df_part.columns:
+                    month_rows.append({
+                        "Year": year,
+                        "Month": month,
+                        "MonthLabel": f"{short} {year}",
+                        "Value": float(df_part[col].sum(skipna=True)),
+                    })
+
+        if not month_rows:
+            st.warning("Data part kosong")
+            return
 
         chart_df = pd.DataFrame(month_rows)
 
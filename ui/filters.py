@@ -1,4 +1,5 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
 import re
 
@@ -85,21 +86,109 @@ def checkbox_group_no_blank(
 
 
 # ===============================
-# APPLY FILTERS (GENERAL)
+# RENTANG BULAN
 # ===============================
-def apply_filters_general(df, pulau_sel=None, prov_sel=None, route_sel=None):
-    if df is None or df.empty:
-        return df
-
-    res = df.copy()
+def month_range_slider(label, months, key="filter_month_range"):
+    """
+    months : label kolom bulan, urut kronologis (urutan kolom sheet)
+    return : list bulan di dalam rentang terpilih (default semua)
+    """
+    if len(months) < 2:
+        return list(months)
+
+    # versi workbook baru bisa membuang bulan yang masih tersimpan di sesi
+    current = st.session_state.get(key)
+    if current is not None and not all(m in months for m in current):
+        del st.session_state[key]
+
+    start, end = st.sidebar.select_slider(
+        label,
+        options=list(months),
+        value=(months[0], months[-1]),
+        key=key,
+    )
+    i, j = months.index(start), months.index(end)
+    return list(months[min(i, j): max(i, j) + 1])
 
-    if pulau_sel and "Pulau" in res.columns:
-        res = res[res["Pulau"].isin(pulau_sel)]
 
-    if prov_sel and "Provinsi" in res.columns:
-        res = res[res["Provinsi"].isin(prov_sel)]
+# ===============================
+# FILTER TANPA COPY (MASK / POSISI BARIS)
+# ===============================
+FILTER_COLUMNS = ("Pulau", "Provinsi", "Route")
+
+
+def filter_rows(df, pulau_sel=None, prov_sel=None, route_sel=None, index=None):
+    """
+    Semua predikat digabung jadi satu mask, satu lintasan, tanpa frame antara.
+    Seleksi kosong / kolom yang tidak ada = tanpa filter.
+
+    index  : data.filterindex.FilterIndex untuk df (opsional), posting
+             dipakai langsung tanpa scan isin
+    return : posisi baris lolos filter (np.ndarray urut),
+             None kalau tidak ada filter aktif (semua baris)
+    """
+    selections = dict(zip(FILTER_COLUMNS, (pulau_sel, prov_sel, route_sel)))
+    active = {c: v for c, v in selections.items() if v and c in df.columns}
+    if not active:
+        return None
+
+    if index is not None:
+        return index.rows(active)
+
+    mask = np.ones(len(df), dtype=bool)
+    for c, selected in active.items():
+        mask &= df[c].isin(selected).to_numpy()
+    return np.flatnonzero(mask)
+
+
+class FilteredFrame:
+    """
+    View lazy atas df: baris baru disalin saat frame() dipanggil,
+    dan hanya kolom yang diminta.
+
+    rows : posisi baris (None = semua baris)
+    """
+
+    def __init__(self, df, rows=None):
+        self.df = df
+        self.rows = rows
+
+    def __len__(self):
+        return len(self.df) if self.rows is None else len(self.rows)
+
+    @property
+    def empty(self):
+        return len(self) == 0 or self.df.shape[1] == 0
+
+    def frame(self, columns=None):
+        """
+        columns : subset kolom (None = semua)
+        return  : DataFrame baris terfilter (index asli dipertahankan)
+        """
+        df = self.df if columns is None else self.df[list(columns)]
+        if self.rows is None:
+            return df.copy(deep=False)     # salinan dangkal, lihat data/registry.py
+        return df.take(self.rows)
+
+
+def filter_view(df, pulau_sel=None, prov_sel=None, route_sel=None, index=None):
+    """
+    return : FilteredFrame, None kalau df None
+    """
+    if df is None:
+        return None
+    if df.empty:
+        return FilteredFrame(df)
+    return FilteredFrame(df, filter_rows(df, pulau_sel, prov_sel, route_sel, index=index))
 
-    if route_sel and "Route" in res.columns:
-        res = res[res["Route"].isin(route_sel)]
 
-    return res
+# ===============================
+# APPLY FILTERS (GENERAL)
+# ===============================
+def apply_filters_general(df, pulau_sel=None, prov_sel=None, route_sel=None, index=None):
+    """
+    Versi materialisasi langsung dari filter_view(...).frame().
+    """
+    if df is None or df.empty:
+        return df
+    return filter_view(df, pulau_sel, prov_sel, route_sel, index=index).frame()